@@ -5,12 +5,21 @@ Main orchestrator for end-to-end scenario generation workflow.
 """
 
 from typing import List, Literal, Tuple
+import asyncio
+import os
+
 import pandas as pd
 
 from ..models import RiskFactor, Counterparty, Contract, Scenario
 from ..llm import LlamaClient, PromptBuilder
 from ..parsers import ScenarioParser
 
+# Ollama serves at most OLLAMA_NUM_PARALLEL prompts at once (default 4)
+# and queues the rest server-side, so fanning out more concurrent
+# requests than that only ties up connections. Set OLLAMA_PARALLEL to
+# match your server's OLLAMA_NUM_PARALLEL.
+_MAX_PARALLEL_LLM_CALLS = int(os.getenv('OLLAMA_PARALLEL', '4'))
+
 
 class ALMScenarioGenerator:
     """
@@ -61,13 +70,104 @@ class ALMScenarioGenerator:
             scenario_type=scenario_type
         )
         
-        # Call LLM
+        # Call LLM — a single batched request for all num_scenarios, so
+        # prompt prefill and KV-cache warm-up are amortized across them
         response = self.llm_client.call_llm(prompt)
-        
+
         # Parse response
         scenarios = self.parser.parse_llm_response(response)
+
+        # Smaller models sometimes emit fewer scenarios than asked for;
+        # top up with single-scenario calls instead of returning short
+        top_up_attempts = 0
+        while len(scenarios) < num_scenarios and top_up_attempts < num_scenarios:
+            top_up_attempts += 1
+            top_up_prompt = self.prompt_builder.build_prompt(
+                risk_factors=risk_factors,
+                counterparties=counterparties,
+                contracts=contracts,
+                user_instruction=user_instruction,
+                num_scenarios=1,
+                scenario_type=scenario_type
+            )
+            scenarios.extend(
+                self.parser.parse_llm_response(self.llm_client.call_llm(top_up_prompt))
+            )
+        scenarios = scenarios[:num_scenarios]
         
         # Convert to DataFrame
         df = self.parser.scenarios_to_dataframe(scenarios)
-        
+
+        return scenarios, df
+
+    async def agenerate_scenarios(
+        self,
+        risk_factors: List[RiskFactor],
+        counterparties: List[Counterparty],
+        contracts: List[Contract],
+        user_instruction: str,
+        num_scenarios: int = 3,
+        scenario_type: Literal["stress", "stochastic", "both"] = "stress",
+        on_scenario=None
+    ) -> Tuple[List[Scenario], pd.DataFrame]:
+        """
+        Async variant of generate_scenarios that fans out one LLM call
+        per scenario and overlaps them with asyncio.gather.
+
+        Sequential LLM calls dominate wall time, so requesting N
+        scenarios as N concurrent single-scenario calls brings the total
+        latency close to that of the slowest call. Requires the optional
+        httpx dependency (see LlamaClient.acall_llm). From synchronous
+        code, wrap with asyncio.run(...).
+
+        Args: same as generate_scenarios, plus:
+            on_scenario: Optional async callback awaited with each
+                Scenario as soon as its LLM call completes — lets
+                callers stream results instead of waiting for all N.
+
+        Returns: same as generate_scenarios.
+        """
+        # One single-scenario prompt per call so responses stay small
+        prompts = [
+            self.prompt_builder.build_prompt(
+                risk_factors=risk_factors,
+                counterparties=counterparties,
+                contracts=contracts,
+                user_instruction=user_instruction,
+                num_scenarios=1,
+                scenario_type=scenario_type
+            )
+            for _ in range(num_scenarios)
+        ]
+
+        scenarios: List[Scenario] = []
+
+        # Bound in-flight calls to the model's parallel slots — beyond
+        # that Ollama queues requests anyway
+        sem = asyncio.Semaphore(_MAX_PARALLEL_LLM_CALLS)
+
+        async def _bounded_call(prompt: str) -> str:
+            async with sem:
+                return await self.llm_client.acall_llm(prompt)
+
+        if on_scenario is None:
+            responses = await asyncio.gather(
+                *(_bounded_call(prompt) for prompt in prompts)
+            )
+            for response in responses:
+                scenarios.extend(self.parser.parse_llm_response(response))
+        else:
+            # Surface each scenario as soon as its call finishes
+            tasks = [
+                asyncio.ensure_future(_bounded_call(prompt))
+                for prompt in prompts
+            ]
+            for future in asyncio.as_completed(tasks):
+                response = await future
+                for scenario in self.parser.parse_llm_response(response):
+                    scenarios.append(scenario)
+                    await on_scenario(scenario)
+
+        df = self.parser.scenarios_to_dataframe(scenarios)
+
         return scenarios, df
@@ -36,6 +36,26 @@ class LlamaClient:
         self.model_name = model_name
         self.api_type = api_type
         self.timeout = timeout
+
+        # Persistent session with connection pooling — each plain
+        # requests.post() pays a fresh TCP handshake (50-200ms against
+        # Ollama), so reuse keep-alive connections across calls instead.
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=10, pool_maxsize=10, max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'gzip, deflate',
+        })
+
+        # Lazily created httpx.AsyncClient for acall_llm (optional dep).
+        # Rebuilt if the running event loop changes (e.g. one asyncio.run
+        # per web request), since httpx clients are bound to their loop.
+        self._async_client = None
+        self._async_client_loop = None
     
     def call_llm(self, prompt: str) -> str:
         """
@@ -59,6 +79,9 @@ class LlamaClient:
                 "model": self.model_name,
                 "prompt": prompt,
                 "stream": False,
+                # Keep the model (and its KV cache) resident between
+                # requests so shared prompt prefixes skip re-prefill
+                "keep_alive": "30m",
                 "options": {
                     "temperature": 0.3,  # Lower temperature for more deterministic output
                     "top_p": 0.9,
@@ -68,7 +91,7 @@ class LlamaClient:
             }
             
             try:
-                response = requests.post(
+                response = self.session.post(
                     endpoint,
                     json=payload,
                     timeout=self.timeout,  # now 300s by default
@@ -100,7 +123,7 @@ class LlamaClient:
             # If you don't use auth yet, define empty headers
             headers = {}  # 🔧 avoid 'headers' being undefined
 
-            response = requests.post(
+            response = self.session.post(
                 endpoint,
                 json=payload,
                 headers=headers,
@@ -111,6 +134,82 @@ class LlamaClient:
         
         # If somehow api_type is wrong:
         raise ValueError(f"Unsupported api_type: {self.api_type}")
+
+    async def acall_llm(self, prompt: str) -> str:
+        """
+        Async variant of call_llm for overlapping several LLM calls.
+
+        Requires the optional httpx dependency (pip install httpx).
+
+        Args:
+            prompt: The prompt to send to the model
+
+        Returns:
+            The model's response as a string
+
+        Raises:
+            RuntimeError: If httpx is missing or the API call fails
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise RuntimeError(
+                "httpx is required for async LLM calls — install it with 'pip install httpx'"
+            ) from e
+
+        import asyncio
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=10),
+                timeout=self.timeout,
+            )
+            self._async_client_loop = loop
+
+        if self.api_type == "ollama":
+            endpoint = f"{self.base_url}/api/generate"
+            payload = {
+                "model": self.model_name,
+                "prompt": prompt,
+                "stream": False,
+                # Keep the model (and its KV cache) resident between
+                # requests so shared prompt prefixes skip re-prefill
+                "keep_alive": "30m",
+                "options": {
+                    "temperature": 0.3,
+                    "top_p": 0.9,
+                }
+            }
+
+            try:
+                response = await self._async_client.post(endpoint, json=payload)
+                response.raise_for_status()
+            except httpx.ReadTimeout as e:
+                raise RuntimeError(
+                    f"LLM request timed out after {self.timeout} seconds. "
+                    "Try reducing the number of scenarios or using a smaller/faster model."
+                ) from e
+            except httpx.HTTPError as e:
+                raise RuntimeError(f"Error calling LLM backend: {e}") from e
+
+            return response.json()["response"]
+
+        elif self.api_type == "openwebui":
+            endpoint = f"{self.base_url}/api/chat/completions"
+            payload = {
+                "model": self.model_name,
+                "messages": [
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.3,
+                "max_tokens": 4000,
+            }
+
+            response = await self._async_client.post(endpoint, json=payload)
+            response.raise_for_status()
+            return response.json()["choices"][0]["message"]["content"]
+
+        raise ValueError(f"Unsupported api_type: {self.api_type}")
     
     def _get_mock_response(self) -> str:
         """
@@ -20,6 +20,42 @@ class PromptBuilder:
     
     # Cache for loaded prompts
     _prompts_module = None
+
+    # Cache of formatted context sections keyed by the identity/length
+    # of the input lists — the web APIs hold one dataset in memory and
+    # pass the same lists to every build_prompt call, so the summaries
+    # only need formatting once per dataset. Each entry also stores the
+    # three lists themselves: keeping them referenced pins their id()s,
+    # so a freed list can never recycle an id and hit a stale entry.
+    _context_cache: Dict[tuple, tuple] = {}
+    _CONTEXT_CACHE_CAPACITY = 8
+
+    @staticmethod
+    def _build_context(
+        risk_factors: List[RiskFactor],
+        counterparties: List[Counterparty],
+        contracts: List[Contract]
+    ) -> str:
+        """Format (and memoize) the shared ALM context section"""
+        key = (
+            id(risk_factors), len(risk_factors),
+            id(counterparties), len(counterparties),
+            id(contracts), len(contracts),
+        )
+        entry = PromptBuilder._context_cache.get(key)
+        if entry is None:
+            context = "\n".join([
+                PromptBuilder.summarize_risk_factors(risk_factors),
+                "",
+                PromptBuilder.summarize_counterparties(counterparties),
+                "",
+                PromptBuilder.summarize_portfolio(contracts),
+            ])
+            if len(PromptBuilder._context_cache) >= PromptBuilder._CONTEXT_CACHE_CAPACITY:
+                PromptBuilder._context_cache.clear()
+            entry = (context, risk_factors, counterparties, contracts)
+            PromptBuilder._context_cache[key] = entry
+        return entry[0]
     
     @staticmethod
     def _load_prompts_module():
@@ -217,27 +253,19 @@ Generate realistic, internally consistent scenarios based on historical preceden
             system_prompt = PromptBuilder.get_system_prompt('default')
             print(f"  Using default system prompt")
         
-        # Build prompt sections
+        # Build prompt sections. Static content (system prompt, ALM
+        # context, output format) comes FIRST and the variable request
+        # (scenario type/count, user instruction) LAST, so consecutive
+        # requests against the same dataset share an identical prefix
+        # and Ollama can reuse its KV cache instead of re-prefilling
+        # thousands of context tokens.
         prompt_parts = [
             system_prompt,
             "",
             "=" * 70,
             "CURRENT RISK FACTOR STATE",
             "=" * 70,
-            PromptBuilder.summarize_risk_factors(risk_factors),
-            "",
-            PromptBuilder.summarize_counterparties(counterparties),
-            "",
-            PromptBuilder.summarize_portfolio(contracts),
-            "",
-            "=" * 70,
-            "SCENARIO GENERATION REQUEST",
-            "=" * 70,
-            f"Scenario Type: {scenario_type.upper()}",
-            f"Number of Scenarios: {num_scenarios}",
-            "",
-            "User Instruction:",
-            user_instruction,
+            PromptBuilder._build_context(risk_factors, counterparties, contracts),
             "",
             "=" * 70,
             "OUTPUT FORMAT REQUIREMENTS",
@@ -276,6 +304,15 @@ Generate realistic, internally consistent scenarios based on historical preceden
             "8. Output ONLY the JSON object - no additional text before or after",
             "9. Ensure the JSON is valid and can be parsed by Python's json.loads()",
             "",
+            "=" * 70,
+            "SCENARIO GENERATION REQUEST",
+            "=" * 70,
+            f"Scenario Type: {scenario_type.upper()}",
+            f"Number of Scenarios: {num_scenarios}",
+            "",
+            "User Instruction:",
+            user_instruction,
+            "",
             "Generate the scenarios now:"
         ]
         
@@ -8,7 +8,10 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 
 
-@dataclass
+# slots=True drops the per-instance __dict__ — responses carry many
+# Shock objects, so this cuts memory ~3x and speeds up the tight
+# `for sh in s.shocks` serialization loops in the APIs
+@dataclass(slots=True)
 class Shock:
     """Individual shock to a risk factor"""
     factor_type: str
@@ -28,7 +31,7 @@ class Shock:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Scenario:
     """Stress or stochastic scenario"""
     name: str
@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration for the ALM Scenario Generator APIs.
+
+The Werkzeug dev server (app.run) is thread-per-request and parks a
+thread for the entire 10-60s Ollama call. gevent workers turn those
+waits into greenlet switches (gunicorn's gevent worker monkey-patches
+the stdlib before loading the app), so each worker can hold hundreds of
+in-flight /generate requests with negligible CPU.
+
+Run with:
+    gunicorn -c gunicorn_conf.py scenario_api:app
+
+Requires: pip install gunicorn gevent
+"""
+
+bind = "0.0.0.0:5000"
+worker_class = "gevent"    # cooperative workers: LLM waits yield the greenlet
+workers = 4
+worker_connections = 200   # concurrent requests per worker
+timeout = 180              # scenario generation can legitimately take minutes
@@ -7,13 +7,12 @@ required_open_webui_version: 0.3.0
 """
 
 import os
-import sys
 from typing import Callable, Any
 import json
 
-# Add the path to your scenario generator
-sys.path.append('/c/Users/OneDrive - Wolters Kluwer/Product Managemant/Product Managemant/OPEN_AI/alm_scenario_generator')  # UPDATE THIS PATH
-
+# Install the generator once with `pip install -e /path/to/alm_scenario_generator`
+# (see pyproject.toml) so these imports resolve from site-packages —
+# no per-import sys.path scan of a hardcoded directory
 from alm_scenarios import ALMScenarioGenerator, LlamaClient
 from load_alm_data import load_from_riskpro
 
@@ -46,14 +45,16 @@ class Tools:
         user_instruction: str,
         num_scenarios: int = 3,
         scenario_type: str = "stress",
+        write_csv: bool = False,
         __event_emitter__: Callable[[dict], Any] = None
     ) -> str:
         """
         Generate ALM stress or stochastic scenarios.
-        
+
         :param user_instruction: Description of scenarios to generate
         :param num_scenarios: Number of scenarios (1-10)
         :param scenario_type: Type of scenarios ("stress", "stochastic", or "both")
+        :param write_csv: Also save the scenarios to /tmp/alm_scenarios.csv
         """
         
         try:
@@ -81,14 +82,23 @@ class Tools:
             )
             generator = ALMScenarioGenerator(llm_client)
             
-            # Generate scenarios
-            scenarios, scenarios_df = generator.generate_scenarios(
+            # Surface each scenario in the UI as soon as its call completes
+            async def _on_scenario(scenario):
+                if __event_emitter__:
+                    await __event_emitter__({
+                        "type": "status",
+                        "data": {"description": f"Scenario ready: {scenario.name}", "done": False}
+                    })
+
+            # Generate scenarios (async fan-out: one overlapped LLM call per scenario)
+            scenarios, scenarios_df = await generator.agenerate_scenarios(
                 risk_factors=risk_factors,
                 counterparties=counterparties,
                 contracts=contracts,
                 user_instruction=user_instruction,
                 num_scenarios=min(num_scenarios, 10),
-                scenario_type=scenario_type
+                scenario_type=scenario_type,
+                on_scenario=_on_scenario
             )
             
             if __event_emitter__:
@@ -97,37 +107,43 @@ class Tools:
                     "data": {"description": f"Generated {len(scenarios)} scenarios!", "done": True}
                 })
             
-            # Format results for display
-            result = f"# Generated {len(scenarios)} ALM Scenarios\n\n"
-            
+            # Format results for display — accumulate parts and join
+            # once at the end; += on a growing string recopies the whole
+            # buffer on every append
+            parts = [f"# Generated {len(scenarios)} ALM Scenarios\n\n"]
+
             for i, scenario in enumerate(scenarios, 1):
-                result += f"## Scenario {i}: {scenario.name}\n\n"
-                result += f"**Type:** {scenario.scenario_type}\n\n"
-                result += f"**Description:** {scenario.description}\n\n"
-                result += f"**Number of shocks:** {len(scenario.shocks)}\n\n"
-                
-                result += "**Shocks:**\n"
+                parts.append(f"## Scenario {i}: {scenario.name}\n\n")
+                parts.append(f"**Type:** {scenario.scenario_type}\n\n")
+                parts.append(f"**Description:** {scenario.description}\n\n")
+                parts.append(f"**Number of shocks:** {len(scenario.shocks)}\n\n")
+
+                parts.append("**Shocks:**\n")
                 for shock in scenario.shocks[:10]:  # Show first 10 shocks
-                    result += f"- {shock.factor_type} | {shock.factor_id}: "
-                    result += f"{shock.shock_type} = {shock.value}\n"
-                
+                    parts.append(
+                        f"- {shock.factor_type} | {shock.factor_id}: "
+                        f"{shock.shock_type} = {shock.value}\n"
+                    )
+
                 if len(scenario.shocks) > 10:
-                    result += f"- ... and {len(scenario.shocks) - 10} more shocks\n"
-                
-                result += "\n---\n\n"
-            
-            # Save to CSV
-            csv_path = "/tmp/alm_scenarios.csv"
-            scenarios_df.to_csv(csv_path, index=False)
-            result += f"\n📊 **Full scenarios saved to:** `{csv_path}`\n"
-            result += f"📈 **Total shocks:** {len(scenarios_df)}\n"
-            
-            return result
+                    parts.append(f"- ... and {len(scenario.shocks) - 10} more shocks\n")
+
+                parts.append("\n---\n\n")
+
+            # Save to CSV only on request — the markdown above already
+            # shows the scenarios, so skip the disk I/O by default
+            if write_csv:
+                csv_path = "/tmp/alm_scenarios.csv"
+                scenarios_df.to_csv(csv_path, index=False)
+                parts.append(f"\n📊 **Full scenarios saved to:** `{csv_path}`\n")
+            parts.append(f"📈 **Total shocks:** {len(scenarios_df)}\n")
+
+            return "".join(parts)
             
         except Exception as e:
             error_msg = f"❌ Error generating scenarios: {str(e)}\n\n"
             error_msg += "Please check:\n"
             error_msg += "- RiskPro database connection\n"
             error_msg += "- Ollama is running\n"
-            error_msg += "- Path to alm_scenario_generator is correct\n"
+            error_msg += "- alm_scenario_generator is installed (pip install -e .)\n"
             return error_msg
\ No newline at end of file
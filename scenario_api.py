@@ -1,152 +1,510 @@
-"""
-ALM Scenario Generator API
-Runs on your PC, accessible from Ubuntu VM
-"""
-
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-
-from alm_scenarios import ALMScenarioGenerator, LlamaClient
-from load_alm_data import load_from_riskpro
-
-app = Flask(__name__)
-CORS(app)  # Allow requests from VM
-
-# Cache data
-cache = {'loaded': False, 'risk_factors': None, 'counterparties': None, 'contracts': None}
-
-
-def load_data():
-    if not cache['loaded']:
-        print("Loading ALM data from RiskPro...")
-        try:
-            cache['risk_factors'], cache['counterparties'], cache['contracts'] = load_from_riskpro(
-                limit_contracts=1000
-            )
-            cache['loaded'] = True
-            print(f"✓ Loaded {len(cache['contracts'])} contracts")
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            raise
-    return cache['risk_factors'], cache['counterparties'], cache['contracts']
-
-
-@app.route('/generate', methods=['POST'])
-def generate():
-    try:
-        data = request.json
-        instruction = data.get('instruction', '')
-        num_scenarios = data.get('num_scenarios', 3)
-        
-        if not instruction:
-            return jsonify({'success': False, 'error': 'Instruction required'}), 400
-        
-        print(f"\n{'='*60}")
-        print(f"New request received")
-        print(f"Instruction: {instruction[:100]}...")
-        print(f"{'='*60}")
-        
-        # Load data
-        risk_factors, counterparties, contracts = load_data()
-        print(f"Data loaded: {len(risk_factors)} risk factors, {len(contracts)} contracts")
-        
-        # Generate scenarios
-        llm_client = LlamaClient(
-            base_url="http://localhost:11434",  # Ollama on same PC
-            model_name="llama3"
-        )
-        generator = ALMScenarioGenerator(llm_client)
-        
-        print("Generating scenarios...")
-        scenarios, df = generator.generate_scenarios(
-            risk_factors=risk_factors,
-            counterparties=counterparties,
-            contracts=contracts,
-            user_instruction=instruction,
-            num_scenarios=min(num_scenarios, 10)
-        )
-        
-        print(f"✓ Generated {len(scenarios)} scenarios")
-        
-        # Save CSV
-        csv_path = "generated_scenarios.csv"
-        df.to_csv(csv_path, index=False)
-        print(f"✓ Saved to {csv_path}")
-        
-        # Format response
-        result = []
-        for s in scenarios:
-            result.append({
-                'name': s.name,
-                'description': s.description,
-                'type': s.scenario_type,
-                'num_shocks': len(s.shocks),
-                'shocks': [
-                    {
-                        'factor_type': sh.factor_type,
-                        'factor_id': sh.factor_id,
-                        'shock_type': sh.shock_type,
-                        'value': sh.value,
-                        'description': sh.description
-                    }
-                    for sh in s.shocks
-                ]
-            })
-        
-        return jsonify({
-            'success': True,
-            'num_scenarios': len(scenarios),
-            'total_shocks': len(df),
-            'scenarios': result
-        })
-        
-    except Exception as e:
-        print(f"✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-
-@app.route('/health', methods=['GET'])
-def health():
-    return jsonify({
-        'status': 'ok',
-        'data_loaded': cache['loaded'],
-        'num_contracts': len(cache['contracts']) if cache['loaded'] else 0
-    })
-
-
-@app.route('/status', methods=['GET'])
-def status():
-    """Detailed status endpoint"""
-    return jsonify({
-        'api_running': True,
-        'data_loaded': cache['loaded'],
-        'risk_factors': len(cache['risk_factors']) if cache['loaded'] else 0,
-        'counterparties': len(cache['counterparties']) if cache['loaded'] else 0,
-        'contracts': len(cache['contracts']) if cache['loaded'] else 0,
-        'ollama_url': 'http://localhost:11434',
-        'riskpro_db': 'RP_1225'
-    })
-
-
-if __name__ == '__main__':
-    print("=" * 80)
-    print("ALM SCENARIO GENERATOR API")
-    print("=" * 80)
-    print()
-    print("Starting API server...")
-    print(f"  Host: 0.0.0.0 (accessible from network)")
-    print(f"  Port: 5000")
-    print()
-    print("Endpoints:")
-    print(f"  POST http://172.27.192.1:5000/generate - Generate scenarios")
-    print(f"  GET  http://172.27.192.1:5000/health - Health check")
-    print(f"  GET  http://172.27.192.1:5000/status - Detailed status")
-    print()
-    print("Press Ctrl+C to stop")
-    print("=" * 80)
-    print()
-    
-    # Run on all interfaces so VM can access it
+"""
+ALM Scenario Generator API
+Runs on your PC, accessible from Ubuntu VM
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import csv
+import hashlib
+import json
+import queue
+import threading
+
+import numpy as np
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask_cors import CORS
+
+try:
+    import orjson
+except ImportError:  # optional speedup — jsonify fallback below
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional — responses just go uncompressed
+    Compress = None
+
+from alm_scenarios import ALMScenarioGenerator, LlamaClient
+from load_alm_data import load_from_riskpro
+
+app = Flask(__name__)
+CORS(app)  # Allow requests from VM
+
+# Scenario JSON is highly repetitive and compresses 5-10x, which
+# matters on the VM-to-host hop; skip bodies under 500 bytes
+if Compress is not None:
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    app.config['COMPRESS_ALGORITHM'] = 'gzip'
+    Compress(app)
+
+
+def ojson(payload):
+    """
+    JSON response via orjson when available — several times faster than
+    jsonify's stdlib json.dumps and emits UTF-8 bytes directly (it also
+    handles numpy scalars). Falls back to jsonify if orjson is missing.
+    """
+    if orjson is None:
+        return jsonify(payload)
+    return Response(orjson.dumps(payload), mimetype='application/json')
+
+# Cache data
+cache = {'loaded': False, 'model_id': None,
+         'risk_factors': None, 'counterparties': None, 'contracts': None}
+
+# Module-level client so every /generate reuses the same pooled
+# keep-alive connections to Ollama instead of paying a TCP handshake
+llm_client = LlamaClient(
+    base_url="http://localhost:11434",  # Ollama on same PC
+    model_name="llama3"
+)
+
+# One generator for all requests — PromptBuilder/ScenarioParser hold no
+# per-request state, so constructing them per call was pure overhead
+generator = ALMScenarioGenerator(llm_client)
+
+
+# Full-response LLM cache: identical /generate requests skip Ollama entirely
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+_RESPONSE_CACHE_CAPACITY = 256
+
+
+def _response_cache_key(payload: dict) -> str:
+    """md5 of the canonical JSON request payload"""
+    return hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _response_cache_get(key):
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            _response_cache.move_to_end(key)
+        return cached
+
+
+def _response_cache_put(key, value):
+    with _response_cache_lock:
+        _response_cache[key] = value
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _RESPONSE_CACHE_CAPACITY:
+            _response_cache.popitem(last=False)
+
+
+# Semantic-similarity cache: paraphrased instructions whose embeddings
+# are within 0.95 cosine similarity reuse a previous response, turning
+# near-duplicate prompts into cache hits without an LLM roundtrip.
+_SEMANTIC_SIM_THRESHOLD = 0.95
+_EMBEDDING_MODEL = "nomic-embed-text"
+_semantic_cache = {'vectors': [], 'meta': [], 'responses': [], 'matrix': None, 'norms': None}
+_semantic_cache_lock = threading.Lock()
+
+
+def _embed_instruction(text: str):
+    """Embed an instruction via Ollama; returns None if embedding fails"""
+    try:
+        r = llm_client.session.post(
+            f"{llm_client.base_url}/api/embeddings",
+            json={'model': _EMBEDDING_MODEL, 'prompt': text},
+            timeout=10
+        )
+        r.raise_for_status()
+        embedding = r.json().get('embedding')
+        return np.asarray(embedding, dtype=np.float32) if embedding else None
+    except Exception as e:
+        print(f"⚠ Embedding unavailable ({e}), skipping semantic cache")
+        return None
+
+
+def _semantic_cache_lookup(query_vec, num_scenarios):
+    """Return the cached response of the most similar instruction, if any"""
+    with _semantic_cache_lock:
+        if not _semantic_cache['vectors']:
+            return None
+        # Rebuild the similarity matrix lazily after inserts
+        if _semantic_cache['matrix'] is None:
+            _semantic_cache['matrix'] = np.vstack(_semantic_cache['vectors'])
+            _semantic_cache['norms'] = np.linalg.norm(_semantic_cache['matrix'], axis=1)
+        matrix = _semantic_cache['matrix']
+        norms = _semantic_cache['norms']
+
+        sims = (matrix @ query_vec) / (norms * np.linalg.norm(query_vec) + 1e-12)
+        best = int(np.argmax(sims))
+        if sims[best] > _SEMANTIC_SIM_THRESHOLD and _semantic_cache['meta'][best] == num_scenarios:
+            print(f"✓ Semantic cache hit (similarity {sims[best]:.3f})")
+            return _semantic_cache['responses'][best]
+    return None
+
+
+def _semantic_cache_add(query_vec, num_scenarios, response):
+    with _semantic_cache_lock:
+        _semantic_cache['vectors'].append(query_vec)
+        _semantic_cache['meta'].append(num_scenarios)
+        _semantic_cache['responses'].append(response)
+        _semantic_cache['matrix'] = None  # force lazy rebuild
+        _semantic_cache['norms'] = None
+
+
+def _semantic_cache_clear():
+    with _semantic_cache_lock:
+        _semantic_cache['vectors'].clear()
+        _semantic_cache['meta'].clear()
+        _semantic_cache['responses'].clear()
+        _semantic_cache['matrix'] = None
+        _semantic_cache['norms'] = None
+
+
+# Header matching ScenarioParser.scenarios_to_dataframe's columns
+_CSV_HEADER = (
+    'scenario_name', 'scenario_description', 'scenario_type', 'probability',
+    'factor_type', 'factor_id', 'shock_type', 'shock_value', 'shock_description'
+)
+
+
+def _write_scenarios_csv(scenarios, csv_path):
+    """
+    Write the shock rows straight from the Scenario objects with
+    csv.writer — pandas' to_csv carries ~10x overhead for a frame this
+    simple, and the DataFrame isn't needed for serialization at all.
+    """
+    with open(csv_path, 'w', buffering=1 << 20, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(_CSV_HEADER)
+        writer.writerows(
+            (s.name, s.description, s.scenario_type, s.probability,
+             sh.factor_type, sh.factor_id, sh.shock_type, sh.value, sh.description)
+            for s in scenarios
+            for sh in s.shocks
+        )
+
+
+# Serializes the initial load so the warmup thread and early requests
+# don't both hit RiskPro under threaded=True
+_load_data_lock = threading.Lock()
+
+# Single-worker executor: the blocking ODBC fetch runs off the request
+# thread, and /prefetch can warm the cache for the next model before
+# the next /generate arrives
+_load_executor = ThreadPoolExecutor(max_workers=1)
+_pending_load = None  # in-flight load Future, guarded by _load_data_lock
+
+
+def _do_load(model_id=None):
+    """Blocking load that fills the module cache (runs on _load_executor)."""
+    suffix = f" (model {model_id})" if model_id else ""
+    print(f"Loading ALM data from RiskPro{suffix}...")
+    try:
+        risk_factors, counterparties, contracts = load_from_riskpro(
+            model_id=model_id,
+            limit_contracts=1000
+        )
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        raise
+    cache['risk_factors'] = risk_factors
+    cache['counterparties'] = counterparties
+    cache['contracts'] = contracts
+    cache['model_id'] = model_id
+    cache['loaded'] = True
+    # Cached responses were built against the previous dataset
+    with _response_cache_lock:
+        _response_cache.clear()
+    _semantic_cache_clear()
+    print(f"✓ Loaded {len(contracts)} contracts")
+    return risk_factors, counterparties, contracts
+
+
+def load_data():
+    # Double-checked locking: the warm path (data already loaded) skips
+    # the lock entirely; the check repeats under the lock so concurrent
+    # cold-start requests can't all launch load_from_riskpro. On a cold
+    # start we join whatever load is already running on the executor
+    # (e.g. one started by /prefetch) instead of issuing our own.
+    global _pending_load
+
+    if cache['loaded']:
+        return cache['risk_factors'], cache['counterparties'], cache['contracts']
+
+    with _load_data_lock:
+        if cache['loaded']:
+            return cache['risk_factors'], cache['counterparties'], cache['contracts']
+        if _pending_load is None or _pending_load.done():
+            _pending_load = _load_executor.submit(_do_load, cache['model_id'])
+        future = _pending_load
+    try:
+        return future.result()
+    finally:
+        with _load_data_lock:
+            if _pending_load is future:
+                _pending_load = None
+
+
+@app.route('/prefetch', methods=['GET', 'POST'])
+def prefetch():
+    """
+    Kick off a background data load without waiting for it, so the next
+    /generate finds the cache warm. Pass ?model_id=X to preload a
+    different model after the caller switches models.
+    """
+    global _pending_load
+    model_id = request.args.get('model_id')
+    with _load_data_lock:
+        if cache['loaded'] and cache['model_id'] == model_id:
+            return jsonify({'status': 'warm', 'model_id': model_id})
+        if _pending_load is None or _pending_load.done():
+            cache['loaded'] = False
+            cache['model_id'] = model_id
+            _pending_load = _load_executor.submit(_do_load, model_id)
+    return jsonify({'status': 'loading', 'model_id': model_id})
+
+
+@app.route('/generate', methods=['POST'])
+def generate():
+    try:
+        data = request.json
+        instruction = data.get('instruction', '')
+        num_scenarios = data.get('num_scenarios', 3)
+        write_csv = data.get('write_csv', False)
+
+        if not instruction:
+            return jsonify({'success': False, 'error': 'Instruction required'}), 400
+        
+        print(f"\n{'='*60}")
+        print(f"New request received")
+        print(f"Instruction: {instruction[:100]}...")
+        print(f"{'='*60}")
+        
+        # Load data
+        risk_factors, counterparties, contracts = load_data()
+        print(f"Data loaded: {len(risk_factors)} risk factors, {len(contracts)} contracts")
+
+        # Return cached response for identical requests (no Ollama roundtrip)
+        cache_key = _response_cache_key({
+            'instruction': instruction,
+            'num_scenarios': num_scenarios,
+            'num_contracts': len(contracts)
+        })
+        cached = _response_cache_get(cache_key)
+        if cached is not None:
+            print("✓ Response cache hit — returning cached scenarios")
+            return ojson(cached)
+
+        # Exact-match miss: try near-duplicate instructions by embedding
+        query_vec = _embed_instruction(instruction)
+        if query_vec is not None:
+            cached = _semantic_cache_lookup(query_vec, num_scenarios)
+            if cached is not None:
+                return ojson(cached)
+
+        print("Generating scenarios...")
+        scenarios, df = generator.generate_scenarios(
+            risk_factors=risk_factors,
+            counterparties=counterparties,
+            contracts=contracts,
+            user_instruction=instruction,
+            num_scenarios=min(num_scenarios, 10)
+        )
+        
+        print(f"✓ Generated {len(scenarios)} scenarios")
+        
+        # Save CSV only when the caller asked for it — most consumers
+        # read the JSON and never download the file, so steady-state
+        # requests skip the disk I/O entirely. /scenarios/<key>.csv
+        # materializes it on demand from the response cache.
+        if write_csv:
+            csv_path = "generated_scenarios.csv"
+            _write_scenarios_csv(scenarios, csv_path)
+            print(f"✓ Saved to {csv_path}")
+        
+        # Format response. The shock dicts are built in one pass over the
+        # DataFrame columns (already flattened by the parser) instead of
+        # five dataclass attribute lookups per shock in a nested loop.
+        # The parser allows scenarios with no shocks at all, in which
+        # case the frame is empty and column-less — skip the column
+        # selection rather than KeyError on it.
+        shock_keys = ('factor_type', 'factor_id', 'shock_type', 'value', 'description')
+        if df.empty:
+            all_shock_dicts = []
+        else:
+            shock_cols = df[['factor_type', 'factor_id', 'shock_type', 'shock_value', 'shock_description']]
+            # None descriptions become NaN inside the frame; map them
+            # back before serializing — stdlib json emits a bare NaN
+            # token (invalid JSON) and the CSV route would print 'nan'
+            shock_cols = shock_cols.where(shock_cols.notna(), None)
+            all_shock_dicts = [
+                dict(zip(shock_keys, row))
+                for row in shock_cols.itertuples(index=False, name=None)
+            ]
+
+        result = []
+        start = 0
+        for s in scenarios:
+            end = start + len(s.shocks)
+            result.append({
+                'name': s.name,
+                'description': s.description,
+                'type': s.scenario_type,
+                'num_shocks': len(s.shocks),
+                'shocks': all_shock_dicts[start:end]
+            })
+            start = end
+        
+        response = {
+            'success': True,
+            'num_scenarios': len(scenarios),
+            'total_shocks': len(df),
+            'scenarios': result,
+            'csv_url': f'/scenarios/{cache_key}.csv'
+        }
+        _response_cache_put(cache_key, response)
+        if query_vec is not None:
+            _semantic_cache_add(query_vec, num_scenarios, response)
+
+        return ojson(response)
+        
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/scenarios/<cache_key>.csv', methods=['GET'])
+def download_scenarios_csv(cache_key):
+    """Materialize the CSV on demand from a cached /generate response"""
+    cached = _response_cache_get(cache_key)
+    if cached is None:
+        return jsonify({'success': False, 'error': 'Unknown or expired scenario set'}), 404
+
+    import io
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(_CSV_HEADER)
+    writer.writerows(
+        (s['name'], s['description'], s['type'], None,
+         sh['factor_type'], sh['factor_id'], sh['shock_type'], sh['value'],
+         sh.get('description'))
+        for s in cached['scenarios']
+        for sh in s['shocks']
+    )
+
+    return Response(
+        buf.getvalue(),
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=generated_scenarios.csv'}
+    )
+
+
+@app.route('/generate/stream', methods=['POST'])
+def generate_stream():
+    """
+    Stream scenarios back as Server-Sent Events.
+
+    /generate waits for all N scenarios before responding; this endpoint
+    fans the LLM calls out (see agenerate_scenarios) and emits each
+    scenario as a `data:` event the moment its call completes, so
+    time-to-first-scenario drops from N*latency to ~1*latency.
+    Requires the optional httpx dependency.
+    """
+    try:
+        data = request.json
+        instruction = data.get('instruction', '')
+        num_scenarios = min(data.get('num_scenarios', 3), 10)
+
+        if not instruction:
+            return jsonify({'success': False, 'error': 'Instruction required'}), 400
+
+        risk_factors, counterparties, contracts = load_data()
+
+        def _stream():
+            q = queue.Queue()
+
+            async def _on_scenario(scenario):
+                q.put(('scenario', scenario.to_dict()))
+
+            async def _produce():
+                try:
+                    scenarios, _ = await generator.agenerate_scenarios(
+                        risk_factors=risk_factors,
+                        counterparties=counterparties,
+                        contracts=contracts,
+                        user_instruction=instruction,
+                        num_scenarios=num_scenarios,
+                        on_scenario=_on_scenario
+                    )
+                    q.put(('done', {'num_scenarios': len(scenarios)}))
+                except Exception as e:
+                    q.put(('error', {'error': str(e)}))
+
+            threading.Thread(
+                target=lambda: asyncio.run(_produce()), daemon=True
+            ).start()
+
+            while True:
+                event, payload = q.get()
+                if event == 'scenario':
+                    yield f"data: {json.dumps(payload)}\n\n"
+                else:
+                    yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+                    break
+
+        return Response(stream_with_context(_stream()), mimetype='text/event-stream')
+
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/health', methods=['GET'])
+def health():
+    return jsonify({
+        'status': 'ok',
+        'data_loaded': cache['loaded'],
+        'num_contracts': len(cache['contracts']) if cache['loaded'] else 0
+    })
+
+
+@app.route('/status', methods=['GET'])
+def status():
+    """Detailed status endpoint"""
+    return jsonify({
+        'api_running': True,
+        'data_loaded': cache['loaded'],
+        'risk_factors': len(cache['risk_factors']) if cache['loaded'] else 0,
+        'counterparties': len(cache['counterparties']) if cache['loaded'] else 0,
+        'contracts': len(cache['contracts']) if cache['loaded'] else 0,
+        'ollama_url': 'http://localhost:11434',
+        'riskpro_db': 'RP_1225'
+    })
+
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("ALM SCENARIO GENERATOR API")
+    print("=" * 80)
+    print()
+    print("Starting API server...")
+    print(f"  Host: 0.0.0.0 (accessible from network)")
+    print(f"  Port: 5000")
+    print()
+    print("Endpoints:")
+    print(f"  POST http://172.27.192.1:5000/generate - Generate scenarios")
+    print(f"  GET  http://172.27.192.1:5000/health - Health check")
+    print(f"  GET  http://172.27.192.1:5000/status - Detailed status")
+    print()
+    print("For production use, run under gunicorn + gevent instead:")
+    print("  gunicorn -c gunicorn_conf.py scenario_api:app")
+    print()
+    print("Press Ctrl+C to stop")
+    print("=" * 80)
+    print()
+
+    # Warm the data cache while Flask binds the socket, so the first
+    # /generate doesn't pay the full RiskPro load latency
+    threading.Thread(target=load_data, daemon=True).start()
+
+    # Dev server fallback — runs on all interfaces so VM can access it.
+    # Use the gunicorn command above for concurrent /generate handling.
     app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
\ No newline at end of file
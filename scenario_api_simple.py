@@ -2,25 +2,84 @@
 Simple API for ALM Scenario Generation
 """
 
-from flask import Flask, request, jsonify
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:  # optional speedup — jsonify fallback below
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional — responses just go uncompressed
+    Compress = None
+
 from alm_scenarios import ALMScenarioGenerator, LlamaClient
 from load_alm_data import load_from_riskpro
 
 app = Flask(__name__)
 CORS(app)
 
+# gzip the repetitive scenario JSON (5-10x smaller on the wire)
+if Compress is not None:
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    app.config['COMPRESS_ALGORITHM'] = 'gzip'
+    Compress(app)
+
+
+def ojson(payload):
+    """orjson-serialized JSON response, falling back to jsonify"""
+    if orjson is None:
+        return jsonify(payload)
+    return Response(orjson.dumps(payload), mimetype='application/json')
+
 cache = {'loaded': False, 'risk_factors': None, 'counterparties': None, 'contracts': None}
 
+# Module-level client so every /generate reuses the same pooled
+# keep-alive connections to Ollama instead of paying a TCP handshake
+llm_client = LlamaClient(
+    base_url="http://localhost:11434",
+    model_name="llama3"
+)
+
+# One generator for all requests — it holds no per-request state
+generator = ALMScenarioGenerator(llm_client)
+
+# Full-response LLM cache: identical /generate requests skip Ollama entirely
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+_RESPONSE_CACHE_CAPACITY = 256
+
+def _response_cache_key(payload):
+    return hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+# Serializes the initial load so the warmup thread and early requests
+# don't both hit RiskPro
+_load_data_lock = threading.Lock()
+
 def load_data():
-    if not cache['loaded']:
-        print("Loading ALM data from RiskPro...")
-        cache['risk_factors'], cache['counterparties'], cache['contracts'] = load_from_riskpro(
-            limit_contracts=1000
-        )
-        cache['loaded'] = True
-        print(f"✓ Loaded {len(cache['contracts'])} contracts")
+    # Double-checked locking: warm path skips the lock, cold path
+    # re-checks under it so concurrent first hits can't double-load
+    if cache['loaded']:
+        return cache['risk_factors'], cache['counterparties'], cache['contracts']
+
+    with _load_data_lock:
+        if not cache['loaded']:
+            print("Loading ALM data from RiskPro...")
+            cache['risk_factors'], cache['counterparties'], cache['contracts'] = load_from_riskpro(
+                limit_contracts=1000
+            )
+            cache['loaded'] = True
+            # Cached responses were built against the previous dataset
+            with _response_cache_lock:
+                _response_cache.clear()
+            print(f"✓ Loaded {len(cache['contracts'])} contracts")
     return cache['risk_factors'], cache['counterparties'], cache['contracts']
 
 @app.route('/generate', methods=['POST'])
@@ -33,13 +92,21 @@ def generate():
         print(f"\nRequest: {instruction[:80]}...")
         
         risk_factors, counterparties, contracts = load_data()
-        
-        llm_client = LlamaClient(
-            base_url="http://localhost:11434",
-            model_name="llama3"
-        )
-        generator = ALMScenarioGenerator(llm_client)
-        
+
+        # Return cached response for identical requests (no Ollama roundtrip)
+        cache_key = _response_cache_key({
+            'instruction': instruction,
+            'num_scenarios': num_scenarios,
+            'num_contracts': len(contracts)
+        })
+        with _response_cache_lock:
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                _response_cache.move_to_end(cache_key)
+        if cached is not None:
+            print("✓ Response cache hit — returning cached scenarios")
+            return ojson(cached)
+
         print("Generating scenarios...")
         scenarios, df = generator.generate_scenarios(
             risk_factors=risk_factors,
@@ -69,7 +136,14 @@ def generate():
                 ]
             })
         
-        return jsonify({'success': True, 'scenarios': result})
+        response = {'success': True, 'scenarios': result}
+        with _response_cache_lock:
+            _response_cache[cache_key] = response
+            _response_cache.move_to_end(cache_key)
+            while len(_response_cache) > _RESPONSE_CACHE_CAPACITY:
+                _response_cache.popitem(last=False)
+
+        return ojson(response)
     except Exception as e:
         import traceback
         print(f"✗ Error: {e}")
@@ -87,4 +161,6 @@ if __name__ == '__main__':
     print("Starting on http://0.0.0.0:5000")
     print("Press Ctrl+C to stop")
     print("="*60)
+    # Warm the data cache while Flask binds the socket
+    threading.Thread(target=load_data, daemon=True).start()
     app.run(host='0.0.0.0', port=5000, debug=False)
@@ -3,34 +3,145 @@ Professional Web Interface for ALM Scenario Generator
 Enhanced with dark fintech theme, charts, and comprehensive reports
 """
 
-from flask import Flask, render_template_string, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify
 from alm_scenarios import ALMScenarioGenerator, LlamaClient
+from alm_scenarios.models import Contract, ContractType
 #from load_from_Risk HUB import load_from_Risk HUB
 from load_alm_data import load_from_riskpro
 
+import atexit
+import gzip
+import logging
+import logging.handlers
+import hashlib
+import itertools
 import json
+import mmap
+import queue
 import random
 import os
 import re
-from datetime import datetime
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, date
 from typing import Dict, List, Optional, Any
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional speedup — stdlib json fallback below
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional — gzip covers every modern browser
+    brotli = None
+
+try:
+    import psutil
+except ImportError:  # optional — without it the dataset cache relies on its LRU bound alone
+    psutil = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # optional — contracts just aren't spilled to disk
+    pa = None
+
 app = Flask(__name__)
 
-# Enhanced cache with metadata for state management
-cache = {
-    'loaded': False,
-    'risk_factors': None,
-    'counterparties': None,
-    'contracts': None,
-    'model_id': None,
-    'limit': None,
-    'load_timestamp': None
-}
+# Compact jsonify output: no key sorting, no pretty-print whitespace —
+# the nested shocks payloads shave noticeable bytes and encode CPU.
+# With orjson installed, route every jsonify through its C serializer.
+app.json.sort_keys = False
+app.json.compact = True
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class _OrjsonProvider(DefaultJSONProvider):
+        """jsonify via orjson — C-speed floats for the numeric payloads"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default,
+                                option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+
+# Module logger with lazy %-formatting: arguments are only interpolated
+# when the level is enabled, unlike the f-strings print() forces.
+# Records go through a queue: request threads just enqueue, and a
+# background listener thread does the stdout formatting and flush, so
+# handlers never serialize on stdio under load.
+log = logging.getLogger(__name__)
+if not log.handlers:
+    _log_queue: queue.Queue = queue.Queue(-1)
+    log.addHandler(logging.handlers.QueueHandler(_log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    _log_listener = logging.handlers.QueueListener(
+        _log_queue, logging.StreamHandler())
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# Enhanced cache with metadata for state management. slots=True makes
+# every access a C-level slot fetch instead of a dict hash lookup and
+# lets mypy/IDEs see the fields.
+@dataclass(slots=True)
+class _Cache:
+    loaded: bool = False
+    risk_factors: Optional[List[Any]] = None
+    counterparties: Optional[List[Any]] = None
+    contracts: Optional[List[Any]] = None
+    model_id: Optional[str] = None
+    limit: Optional[int] = None
+    load_timestamp: Optional[str] = None
+    # Last generated scenarios DataFrame, kept so /api/scenarios/export.csv
+    # can serve the full shock-level CSV without a client-side rebuild
+    last_df: Optional[Any] = None
+    last_csv_name: Optional[str] = None
+
+cache = _Cache()
 
 # Prompts storage file
 PROMPTS_FILE = 'custom_prompts.json'
 
+# Above this size, load_prompts memory-maps the file instead of reading
+# it into a Python bytes object first
+_PROMPTS_MMAP_THRESHOLD = 1 << 20
+
+# Parsed-prompts cache keyed by the file's (mtime_ns, size) — the admin
+# endpoints call load_prompts on every hit and a stat is far cheaper
+# than a reparse; the key changes the moment anything rewrites the file
+_prompts_cache = {'key': None, 'value': None, 'by_id': None}
+_prompts_cache_lock = threading.Lock()
+
+# Serializes first-run seeding of the default prompts
+_first_run_lock = threading.Lock()
+
+# Built once at import — the cold-start branch only copies the dict
+# instead of reconstructing every field plus two datetime allocations
+_STARTUP_ISO = datetime.now().isoformat()
+_DEFAULT_PROMPTS_TEMPLATE = (
+    {
+        'id': 'default',
+        'name': 'Default ALM Expert',
+        'description': 'Balanced approach for general stress testing',
+        'prompt_text': 'You are an expert quantitative risk analyst specializing in ALM.',
+        'variables': [],
+        'tags': ['default'],
+        'created_at': _STARTUP_ISO,
+        'updated_at': _STARTUP_ISO,
+        'is_default': True
+    },
+)
+
 
 # ============================================================================
 # PROMPT MANAGEMENT FUNCTIONS
@@ -38,85 +149,327 @@ PROMPTS_FILE = 'custom_prompts.json'
 
 def load_prompts() -> List[Dict[str, Any]]:
     """Load prompts from JSON file"""
+    # A queued-but-unflushed save is the newest state — serve it so
+    # reads never see the stale on-disk copy (also covers the first-run
+    # defaults below while their debounced write is still pending)
+    with _pending_prompts_lock:
+        if _pending_prompts is not None:
+            return _pending_prompts
+
     if not os.path.exists(PROMPTS_FILE):
-        default_prompts = [
-            {
-                'id': 'default',
-                'name': 'Default ALM Expert',
-                'description': 'Balanced approach for general stress testing',
-                'prompt_text': 'You are an expert quantitative risk analyst specializing in ALM.',
-                'variables': [],
-                'tags': ['default'],
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat(),
-                'is_default': True
-            }
-        ]
-        save_prompts(default_prompts)
-        return default_prompts
-    
+        with _first_run_lock:
+            # Re-check under the lock so concurrent cold-start requests
+            # don't each seed (and queue a write of) the defaults
+            with _pending_prompts_lock:
+                if _pending_prompts is not None:
+                    return _pending_prompts
+            if not os.path.exists(PROMPTS_FILE):
+                default_prompts = [dict(p) for p in _DEFAULT_PROMPTS_TEMPLATE]
+                # save_prompts queues the write — the request returns
+                # with the in-memory list, no synchronous fsync
+                save_prompts(default_prompts)
+                return default_prompts
+
     try:
-        with open(PROMPTS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # Skip the reparse entirely when the file hasn't changed since
+        # the last load
+        st = os.stat(PROMPTS_FILE)
+        cache_key = (st.st_mtime_ns, st.st_size)
+        with _prompts_cache_lock:
+            if _prompts_cache['key'] == cache_key:
+                return _prompts_cache['value']
+
+        # Read the whole file as bytes and parse in one shot — orjson's
+        # C parser is several times faster than json.load going through
+        # a text wrapper, and one read avoids chunked-buffer copies.
+        # Multi-MB prompt libraries are memory-mapped instead, so the
+        # parser walks the kernel's page cache with no user-space copy.
+        with open(PROMPTS_FILE, 'rb') as f:
+            prompts = None
+            if st.st_size > _PROMPTS_MMAP_THRESHOLD:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    try:
+                        # orjson rejects raw mmap objects; a memoryview
+                        # keeps the parse zero-copy over the mapping
+                        view = memoryview(mm)
+                        try:
+                            prompts = orjson.loads(view) if orjson is not None else json.loads(bytes(view))
+                        finally:
+                            view.release()
+                    finally:
+                        mm.close()
+                except (ValueError, OSError):
+                    f.seek(0)  # mmap unavailable (e.g. locking) — plain read
+            if prompts is None:
+                data = f.read()
+                prompts = orjson.loads(data) if orjson is not None else json.loads(data)
+
+        with _prompts_cache_lock:
+            _prompts_cache['key'] = cache_key
+            _prompts_cache['value'] = prompts
+            _prompts_cache['by_id'] = {p['id']: p for p in prompts}
+        return prompts
     except Exception as e:
-        print(f"Error loading prompts: {e}")
+        log.error("Error loading prompts: %s", e)
         return []
 
-def save_prompts(prompts: List[Dict[str, Any]]) -> bool:
-    """Save prompts to JSON file"""
+
+def get_prompt_by_id(prompt_id: str) -> Optional[Dict[str, Any]]:
+    """O(1) prompt lookup via the cached id index.
+
+    load_prompts refreshes the index whenever the file changes; falls
+    back to a linear scan only when the cache is cold (load error).
+    """
+    prompts = load_prompts()
+    with _prompts_cache_lock:
+        index = _prompts_cache['by_id'] if _prompts_cache['value'] is prompts else None
+    if index is not None:
+        return index.get(prompt_id)
+    return next((p for p in prompts if p['id'] == prompt_id), None)
+
+def _write_prompts(prompts: List[Dict[str, Any]]) -> bool:
+    """Serialize and atomically write the prompts file"""
     try:
-        with open(PROMPTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(prompts, f, indent=2, ensure_ascii=False)
+        # Invalidate while the file is changing, repopulate on success
+        with _prompts_cache_lock:
+            _prompts_cache['key'] = None
+
+        # Serialize to bytes first, then one big write to a temp file
+        # swapped into place — a single syscall instead of one per JSON
+        # token, and a crash mid-write can't truncate the live file
+        if orjson is not None:
+            payload = orjson.dumps(prompts, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(prompts, indent=2, ensure_ascii=False).encode('utf-8')
+        tmp_path = PROMPTS_FILE + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, PROMPTS_FILE)
+
+        st = os.stat(PROMPTS_FILE)
+        with _prompts_cache_lock:
+            _prompts_cache['key'] = (st.st_mtime_ns, st.st_size)
+            _prompts_cache['value'] = prompts
+            _prompts_cache['by_id'] = {p['id']: p for p in prompts}
         return True
     except Exception as e:
-        print(f"Error saving prompts: {e}")
+        log.error("Error saving prompts: %s", e)
         return False
 
+
+# Write-behind saver: bursts of save_prompts calls (multi-prompt edits,
+# imports) coalesce into one serialization + fsync 250 ms after the
+# last call, with an atexit flush for durability on shutdown
+_PROMPTS_FLUSH_DELAY = 0.25
+_pending_prompts: Optional[List[Dict[str, Any]]] = None
+_pending_prompts_timer = None
+_pending_prompts_lock = threading.Lock()
+
+
+def _flush_prompts():
+    global _pending_prompts, _pending_prompts_timer
+    with _pending_prompts_lock:
+        prompts = _pending_prompts
+        _pending_prompts = None
+        if _pending_prompts_timer is not None:
+            _pending_prompts_timer.cancel()
+            _pending_prompts_timer = None
+    if prompts is not None:
+        _write_prompts(prompts)
+
+
+atexit.register(_flush_prompts)
+
+
+def save_prompts(prompts: List[Dict[str, Any]]) -> bool:
+    """Save prompts to JSON file (coalesced; hits disk within ~250 ms)"""
+    global _pending_prompts, _pending_prompts_timer
+    # The handlers mutate the cached list in place, so refresh the id
+    # index now rather than 250 ms later at flush time — a lookup
+    # right after an add/import must see the new prompt
+    with _prompts_cache_lock:
+        if _prompts_cache['value'] is prompts:
+            _prompts_cache['by_id'] = {p['id']: p for p in prompts}
+    with _pending_prompts_lock:
+        _pending_prompts = prompts
+        if _pending_prompts_timer is not None:
+            _pending_prompts_timer.cancel()
+        _pending_prompts_timer = threading.Timer(_PROMPTS_FLUSH_DELAY, _flush_prompts)
+        _pending_prompts_timer.daemon = True
+        _pending_prompts_timer.start()
+    return True
+
+# Compiled once — extract_variables runs per prompt when rendering the
+# prompts tab
+_VAR_RE = re.compile(r'\{(\w+)\}')
+
 def extract_variables(prompt_text: str) -> List[str]:
-    """Extract {variable} placeholders"""
-    return list(set(re.findall(r'\{(\w+)\}', prompt_text)))
+    """Extract {variable} placeholders in first-seen order"""
+    # dict.fromkeys dedupes in C while keeping the order variables
+    # appear in the prompt, so rendered forms are stable
+    return list(dict.fromkeys(_VAR_RE.findall(prompt_text)))
+
+# Compiled once; the counter keeps IDs unique within the same second,
+# which the timestamp alone can't guarantee during batch imports
+_ID_CLEAN_RE = re.compile(r'[^a-z0-9_]')
+_id_counter = itertools.count()
 
 def generate_prompt_id(name: str) -> str:
     """Generate unique ID"""
-    base_id = re.sub(r'[^a-z0-9_]', '_', name.lower())
-    return f"{base_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    base_id = _ID_CLEAN_RE.sub('_', name.lower())
+    # time.strftime skips the datetime object allocation
+    return f"{base_id}_{time.strftime('%Y%m%d%H%M%S')}_{next(_id_counter):x}"
+
+# Columnar spill of the most recently loaded contracts. Arrow IPC files
+# can be memory-mapped by other processes (analytics scripts, extra
+# gunicorn workers) with zero copy, instead of each one re-querying
+# Risk HUB or re-pickling Python objects.
+CONTRACTS_ARROW_FILE = 'contracts_cache.arrow'
+
+def _persist_contracts_arrow(contracts) -> None:
+    """Spill the contracts to an Arrow IPC file (no-op without pyarrow)"""
+    if pa is None:
+        return
+    try:
+        table = pa.Table.from_pylist([c.to_dict() for c in contracts])
+        with pa.OSFile(CONTRACTS_ARROW_FILE, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    except Exception as e:
+        log.warning("Could not persist contracts to Arrow: %s", e)
+
+def load_contracts_arrow() -> List[Contract]:
+    """
+    Rebuild Contract objects from the spilled Arrow file.
+
+    The file is memory-mapped, so the columnar read is zero-copy from
+    the page cache; only the final object construction touches Python.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read the contracts spill file")
+    with pa.memory_map(CONTRACTS_ARROW_FILE, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        columns = {name: table.column(name).to_pylist() for name in table.column_names}
+    return [
+        Contract(
+            contract_id=cid,
+            contract_type=ContractType(ctype),
+            currency=currency,
+            notional=notional,
+            maturity_date=date.fromisoformat(maturity),
+            linked_yield_curve=yc,
+            linked_spread_curve=sc,
+            linked_fx_pair=fx,
+            linked_equity=eq,
+            counterparty_id=cp,
+            is_asset=is_asset,
+            rate=rate
+        )
+        for cid, ctype, currency, notional, maturity, yc, sc, fx, eq, cp, is_asset, rate in zip(
+            columns['contract_id'], columns['contract_type'], columns['currency'],
+            columns['notional'], columns['maturity_date'], columns['linked_yield_curve'],
+            columns['linked_spread_curve'], columns['linked_fx_pair'], columns['linked_equity'],
+            columns['counterparty_id'], columns['is_asset'], columns['rate']
+        )
+    ]
+
+# Keyed dataset cache: reloading a (model_id, limit) combination that
+# was already fetched short-circuits the expensive Risk HUB query.
+# Bounded to a few entries since each holds a full contract set.
+_DATASET_CACHE_CAPACITY = 4
+_dataset_cache = OrderedDict()
+
+# Evict cold datasets when the worker's RSS grows past this limit, so a
+# long-lived process serving many models can't pin memory indefinitely
+_CACHE_RSS_LIMIT = int(os.getenv('ALM_CACHE_RSS_LIMIT_MB', '2048')) * (1 << 20)
+
+def _evict_on_memory_pressure():
+    """Drop LRU dataset entries while process RSS exceeds the limit"""
+    if psutil is None:
+        return
+    try:
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        # Keep the MRU entry — it's the dataset /generate is using
+        while rss > _CACHE_RSS_LIMIT and len(_dataset_cache) > 1:
+            key, _ = _dataset_cache.popitem(last=False)
+            log.warning("Memory pressure (%d MB RSS) — evicted dataset %s", rss >> 20, key)
+            rss = process.memory_info().rss
+    except Exception as e:
+        log.warning("Memory-pressure check failed: %s", e)
 
 def load_data_with_config(model_id=None, limit=None):
     """Load data with specific configuration and cache it"""
-    print(f"📊 Loading data with config: model_id={model_id}, limit={limit}")
-    
-    # Call load_from_Risk HUB with parameters
-    risk_factors, counterparties, contracts = load_from_riskpro(
-        model_id=model_id,
-        limit_contracts=limit
-    )
-    
-    # Store in cache with metadata
-    cache['loaded'] = True
-    cache['risk_factors'] = risk_factors
-    cache['counterparties'] = counterparties
-    cache['contracts'] = contracts
-    cache['model_id'] = model_id
-    cache['limit'] = limit
-    cache['load_timestamp'] = datetime.now().isoformat()
-    
-    print(f"✓ Loaded {len(contracts)} contracts, {len(counterparties)} counterparties")
-    print(f"✓ Data cached in memory")
-    
+    key = (model_id, limit)
+    entry = _dataset_cache.get(key)
+    if entry is not None:
+        _dataset_cache.move_to_end(key)
+        risk_factors, counterparties, contracts, loaded_at = entry
+        log.info("Dataset cache hit: model_id=%s, limit=%s (loaded %s)", model_id, limit, loaded_at)
+    else:
+        log.info("Loading data with config: model_id=%s, limit=%s", model_id, limit)
+
+        # Call load_from_Risk HUB with parameters
+        risk_factors, counterparties, contracts = load_from_riskpro(
+            model_id=model_id,
+            limit_contracts=limit
+        )
+
+        loaded_at = datetime.now().isoformat()
+        _dataset_cache[key] = (risk_factors, counterparties, contracts, loaded_at)
+        while len(_dataset_cache) > _DATASET_CACHE_CAPACITY:
+            _dataset_cache.popitem(last=False)
+        _evict_on_memory_pressure()
+
+        log.info("Loaded %d contracts, %d counterparties", len(contracts), len(counterparties))
+        log.debug("Data cached in memory")
+        _persist_contracts_arrow(contracts)
+
+    # Point the active-dataset cache (used by /generate) at this entry
+    cache.loaded = True
+    cache.risk_factors = risk_factors
+    cache.counterparties = counterparties
+    cache.contracts = contracts
+    cache.model_id = model_id
+    cache.limit = limit
+    cache.load_timestamp = loaded_at
+
     return risk_factors, counterparties, contracts
 
 def get_cached_data():
     """Get data from cache - used by generate endpoint"""
-    if not cache['loaded']:
+    if not cache.loaded:
         raise ValueError("No data loaded. Please load data first from the Data Loading tab.")
-    return cache['risk_factors'], cache['counterparties'], cache['contracts']
+    return cache.risk_factors, cache.counterparties, cache.contracts
+
+# Batched RNG for the demo impact metrics: one vectorized PCG64 draw
+# refills 4096 rows at a time instead of three per-call Mersenne
+# Twister invocations on a hot demo endpoint
+_RNG = np.random.default_rng()
+_METRICS_LOW = (-35.0, -30.0, 10.0)
+_METRICS_HIGH = (-5.0, -3.0, 60.0)
+_metrics_buf = _RNG.uniform(_METRICS_LOW, _METRICS_HIGH, size=(4096, 3))
+_metrics_idx = 0
+_metrics_lock = threading.Lock()
 
 def generate_impact_metrics():
     """Generate simulated impact metrics for demo purposes"""
+    global _metrics_buf, _metrics_idx
+    with _metrics_lock:
+        if _metrics_idx >= len(_metrics_buf):
+            _metrics_buf = _RNG.uniform(_METRICS_LOW, _METRICS_HIGH, size=(4096, 3))
+            _metrics_idx = 0
+        nii, eve, var = _metrics_buf[_metrics_idx]
+        _metrics_idx += 1
     return {
-        'nii': round(random.uniform(-35, -5), 1),
-        'eve': round(random.uniform(-30, -3), 1),
-        'var': round(random.uniform(10, 60), 1)
+        'nii': round(float(nii), 1),
+        'eve': round(float(eve), 1),
+        'var': round(float(var), 1)
     }
 
 HTML = """
@@ -569,6 +922,70 @@ HTML = """
         @keyframes spin {
             to { transform: rotate(360deg); }
         }
+
+        /* Prompt messages: one persistent element toggled via classes;
+           the fade-out is pure CSS, so no timer or innerHTML churn */
+        .prompt-msg {
+            padding: 1rem;
+            border-radius: 8px;
+            margin-bottom: 1rem;
+            border: 1px solid;
+            opacity: 0;
+            visibility: hidden;
+        }
+
+        .prompt-msg.success {
+            background: rgba(34, 197, 94, 0.1);
+            border-color: rgba(34, 197, 94, 0.2);
+            color: var(--success);
+        }
+
+        .prompt-msg.error {
+            background: rgba(239, 68, 68, 0.1);
+            border-color: rgba(239, 68, 68, 0.2);
+            color: var(--destructive);
+        }
+
+        .prompt-msg.show {
+            animation: messageFade 3s forwards;
+        }
+
+        /* Data-load messages: persistent element, class-toggled states */
+        .data-msg {
+            padding: 1rem;
+            border-radius: 8px;
+            border: 1px solid;
+            white-space: pre-line;
+            font-weight: 600;
+        }
+
+        .data-msg.success {
+            background: rgba(34, 197, 94, 0.1);
+            border-color: rgba(34, 197, 94, 0.2);
+            color: var(--success);
+        }
+
+        .data-msg.error {
+            background: rgba(239, 68, 68, 0.1);
+            border-color: rgba(239, 68, 68, 0.2);
+            color: var(--destructive);
+        }
+
+        /* Generate-tab data indicator states (toggled by class) */
+        .status-loaded {
+            background: rgba(34, 197, 94, 0.1);
+            border-color: rgba(34, 197, 94, 0.2);
+        }
+
+        .status-empty {
+            background: rgba(239, 68, 68, 0.1);
+            border-color: rgba(239, 68, 68, 0.2);
+        }
+
+        @keyframes messageFade {
+            0%, 80% { opacity: 1; visibility: visible; }
+            100% { opacity: 0; visibility: hidden; }
+        }
         
         /* Results Section */
         .results-section {
@@ -1069,7 +1486,7 @@ HTML = """
             </button>
             <button class="tab" data-tab="prompts" onclick="switchTab('prompts')">
                 🧠 Expert's Knowledge
-                <span class="tab-badge" id="promptsBadge">0</span>
+                <span class="tab-badge" id="promptsBadge">__PROMPTS_COUNT__</span>
             </button>
             <button class="tab" data-tab="generate" onclick="switchTab('generate')">
                 ⚙️ Generate
@@ -1094,7 +1511,7 @@ HTML = """
                         </p>
                     </div>
                     
-                    <div id="dataLoadMessage"></div>
+                    <div id="dataLoadMessage"><div class="data-msg" hidden></div></div>
                     
                     <!-- Risk HUB Data Section -->
                     <div style="background: rgba(20, 184, 166, 0.05); border: 1px solid rgba(20, 184, 166, 0.2); border-radius: 10px; padding: 1.5rem; margin-bottom: 1.5rem;">
@@ -1224,9 +1641,31 @@ HTML = """
                         </div>
                     </div>
                     
-                    <!-- Data Status Indicator -->
-                    <div id="generateDataStatus" style="padding: 1rem; border-radius: 8px; margin-bottom: 1.5rem; border: 1px solid;">
-                        Loading status...
+                    <!-- Data Status Indicator: both states are rendered
+                         once; JS only flips hidden and fills the summary -->
+                    <div id="generateDataStatus" class="status-empty" style="padding: 1rem; border-radius: 8px; margin-bottom: 1.5rem; border: 1px solid;">
+                        <div id="generateStatusLoaded" hidden>
+                            <div style="display: flex; align-items: center; justify-content: space-between;">
+                                <div>
+                                    <strong style="color: var(--success);">✓ Data Loaded:</strong>
+                                    <span style="color: var(--foreground);" id="generateStatusSummary"></span>
+                                </div>
+                                <button type="button" class="btn btn-outline" onclick="switchTab('data')" style="padding: 6px 12px; font-size: 0.875rem;">
+                                    Reload Data
+                                </button>
+                            </div>
+                        </div>
+                        <div id="generateStatusEmpty">
+                            <div style="display: flex; align-items: center; justify-content: space-between;">
+                                <div>
+                                    <strong style="color: var(--destructive);">⚠ No Data Loaded</strong>
+                                    <span style="color: var(--muted); font-size: 0.875rem;">Please load data before generating scenarios</span>
+                                </div>
+                                <button type="button" class="btn btn-primary" onclick="switchTab('data')" style="padding: 6px 12px; font-size: 0.875rem;">
+                                    Go to Data Loading
+                                </button>
+                            </div>
+                        </div>
                     </div>
                     
                     <!-- LLM Prompt Selection -->
@@ -1269,7 +1708,7 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
                             <div class="form-group">
                                 <label>Number of Scenarios</label>
                                 <div class="slider-container">
-                                    <input type="range" id="numScenarios" min="1" max="15" value="3" oninput="updateSliderValue()">
+                                    <input type="range" id="numScenarios" min="1" max="15" value="3">
                                     <span class="slider-value" id="sliderValue">3</span>
                                 </div>
                             </div>
@@ -1372,9 +1811,11 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
                     <p style="font-size: 0.875rem; color: var(--muted);">Manage your custom prompt templates</p>
                 </div>
                 
-                <div id="promptMessage"></div>
-                
+                <div id="promptMessage"><div class="prompt-msg"></div></div>
+
                 <div style="margin-bottom: 1.5rem;">
+                    <input type="text" id="promptSearch" placeholder="🔍 Filter prompts by name or description..."
+                           style="width: 100%; margin-bottom: 0.75rem;">
                     <table style="width: 100%; border-collapse: collapse;" id="promptsTable">
                         <thead>
                             <tr style="background: var(--secondary); border-bottom: 1px solid var(--border);">
@@ -1389,9 +1830,20 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
                             </tr>
                         </tbody>
                     </table>
+                    <!-- Parsed once; renderPromptsTable clones rows from it -->
+                    <template id="promptRowTpl">
+                        <tr style="border-bottom: 1px solid var(--border); cursor: pointer;">
+                            <td style="padding: 12px; font-weight: 600; color: var(--primary);"></td>
+                            <td style="padding: 12px; color: var(--muted);"></td>
+                            <td style="padding: 12px;">
+                                <button class="btn btn-outline" data-action="edit" style="padding: 6px 12px; font-size: 0.75rem;">Edit</button>
+                                <button class="btn" data-action="delete" style="padding: 6px 12px; font-size: 0.75rem; background: var(--destructive); color: white;">Delete</button>
+                            </td>
+                        </tr>
+                    </template>
                 </div>
-                
-                <div style="background: var(--secondary); padding: 1.5rem; border-radius: 8px;">
+
+                <div id="promptEditor" style="background: var(--secondary); padding: 1.5rem; border-radius: 8px;">
                     <h3 style="margin-bottom: 1rem;">Prompt Editor</h3>
                     
                     <input type="hidden" id="currentPromptId">
@@ -1429,6 +1881,42 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
         
 <!-- Results Tab -->
         <div class="tab-content" id="results-content">
+            <!-- Parsed once; buildScenarioCard clones cards from it and
+                 patches the data-field hooks -->
+            <template id="scenarioCardTpl">
+                <div class="scenario-card">
+                    <div class="scenario-header">
+                        <div class="scenario-top">
+                            <div>
+                                <div class="scenario-meta">
+                                    <span class="scenario-id" data-field="id"></span>
+                                    <span class="scenario-badge" data-field="badge"></span>
+                                </div>
+                                <div class="scenario-name" data-field="name"></div>
+                            </div>
+                            <div class="scenario-impacts">
+                                <div class="impact-item">
+                                    <div class="impact-label">NII Impact</div>
+                                    <div class="impact-value" data-field="nii"></div>
+                                </div>
+                                <div class="impact-item">
+                                    <div class="impact-label">EVE Impact</div>
+                                    <div class="impact-value" data-field="eve"></div>
+                                </div>
+                            </div>
+                        </div>
+                        <div class="scenario-desc" data-field="desc"></div>
+                        <div class="scenario-footer">
+                            <div class="shocks-count" data-field="shocksCount"></div>
+                            <button class="toggle-btn">View Details ▼</button>
+                        </div>
+                    </div>
+                    <div class="shocks-detail">
+                        <div class="shocks-title">Applied Shocks</div>
+                        <div class="shocks-list"></div>
+                    </div>
+                </div>
+            </template>
             <div id="resultsContainer">
                 <div class="empty-state">
                     <div class="empty-icon">📈</div>
@@ -1485,48 +1973,167 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
     </main>
     
     <script>
+        // Diagnostic logging is off unless the page is opened with
+        // ?debug — console.log with computed arguments (object
+        // snapshots in particular) costs time even with devtools
+        // closed. Genuine failures still use console.error directly.
+        const DEBUG = new URLSearchParams(location.search).has('debug');
+        const log = DEBUG ? console.log.bind(console) : () => {};
+
         // ====================================================================
         // PROMPTS MANAGEMENT
         // ====================================================================
-        
+
         let allPrompts = [];
+        let promptsById = new Map();  // O(1) id lookup for row clicks
+        let promptsLoadedOnce = false;  // first fetch deferred to tab visit
         let currentPromptId = null;
-        
-        async function loadPrompts() {
+        let promptsETag = null;
+        let promptsCacheTime = 0;
+
+        // localStorage snapshots: hydrate instantly on reload, then
+        // revalidate over the network with the stored ETag. Bump the
+        // version suffix to invalidate across schema changes.
+        const PROMPTS_LS_KEY = 'almPrompts.v1';
+        const DATA_CACHE_LS_KEY = 'almDataCache.v1';
+
+        function persistPrompts() {
+            try {
+                localStorage.setItem(PROMPTS_LS_KEY, JSON.stringify({ etag: promptsETag, prompts: allPrompts }));
+            } catch (e) { /* quota/private mode — snapshot is best-effort */ }
+        }
+
+        function hydrateFromLocalStorage() {
             try {
-                const response = await fetch('/api/prompts');
+                const stored = JSON.parse(localStorage.getItem(PROMPTS_LS_KEY));
+                if (stored && Array.isArray(stored.prompts) && stored.prompts.length) {
+                    promptsETag = stored.etag || null;
+                    allPrompts = stored.prompts;
+                    indexPrompts(allPrompts);
+                    promptsById = new Map(allPrompts.map(p => [p.id, p]));
+                    getPromptEls().badge.textContent = allPrompts.length;
+                    renderPromptsTable(allPrompts);
+                }
+                const data = JSON.parse(localStorage.getItem(DATA_CACHE_LS_KEY));
+                if (data && data.loaded) {
+                    dataCache = data;
+                    scheduleStatusRefresh();
+                }
+            } catch (e) { /* corrupt snapshot — the network load takes over */ }
+        }
+
+        async function loadPrompts(force = false) {
+            // Debounce rapid tab clicks, and send a conditional request
+            // so the server can answer 304 when nothing changed
+            if (!force && allPrompts.length && Date.now() - promptsCacheTime < 2000) return;
+            try {
+                const headers = {};
+                if (promptsETag) headers['If-None-Match'] = promptsETag;
+                const response = await fetch('/api/prompts', { headers });
+                promptsCacheTime = Date.now();
+                if (response.status === 304) return;  // allPrompts is current
                 const data = await response.json();
                 if (data.success) {
+                    promptsETag = response.headers.get('ETag');
                     allPrompts = data.prompts;
-                    document.getElementById('promptsBadge').textContent = data.prompts.length;
+                    indexPrompts(allPrompts);
+                    promptsById = new Map(data.prompts.map(p => [p.id, p]));
+                    getPromptEls().badge.textContent = data.prompts.length;
                     renderPromptsTable(data.prompts);
+                    persistPrompts();
                 }
             } catch (error) {
                 console.error('Error loading prompts:', error);
             }
         }
         
+        // Search index: the lowercase haystack is computed once per
+        // load, so filter keystrokes allocate nothing per prompt
+        function indexPrompts(prompts) {
+            for (const p of prompts) {
+                p._lc = (p.name + ' ' + (p.description || '')).toLowerCase();
+            }
+        }
+
+        function filterPrompts() {
+            const q = document.getElementById('promptSearch').value.trim().toLowerCase();
+            renderPromptsTable(q ? allPrompts.filter(p => p._lc.includes(q)) : allPrompts);
+        }
+
+        // Keyed row cache: reloads only touch rows whose data actually
+        // changed instead of re-parsing the whole tbody's HTML
+        const promptRowCache = new Map();
+
+        // Editor field refs, resolved once — the save/edit/clear paths
+        // hit these on every interaction, so skip repeated id lookups
+        let promptEls = null;
+
+        function getPromptEls() {
+            if (!promptEls) {
+                promptEls = Object.freeze({
+                    id: document.getElementById('currentPromptId'),
+                    name: document.getElementById('promptName'),
+                    description: document.getElementById('promptDescription'),
+                    text: document.getElementById('promptText'),
+                    tags: document.getElementById('promptTags'),
+                    badge: document.getElementById('promptsBadge'),
+                    editor: document.getElementById('promptEditor')
+                });
+            }
+            return promptEls;
+        }
+
+        function buildPromptRow() {
+            // Cloning the pre-parsed <template> fragment is faster than
+            // building elements one by one (and never runs the HTML
+            // parser on user-controlled strings — textContent only).
+            // Clicks are handled by the delegated tbody listener, so
+            // rows carry no handlers of their own.
+            const tpl = document.getElementById('promptRowTpl');
+            return tpl.content.firstElementChild.cloneNode(true);
+        }
+
         function renderPromptsTable(prompts) {
             const tbody = document.getElementById('promptsTableBody');
-            if (!tbody || prompts.length === 0) {
-                if (tbody) tbody.innerHTML = '<tr><td colspan="3" style="padding:12px; text-align:center; color:var(--muted)">No prompts yet</td></tr>';
+            if (!tbody) return;
+            if (prompts.length === 0) {
+                promptRowCache.clear();
+                tbody.innerHTML = '<tr><td colspan="3" style="padding:12px; text-align:center; color:var(--muted)">No prompts yet</td></tr>';
                 return;
             }
-            
-            tbody.innerHTML = prompts.map(p => `
-                <tr style="border-bottom: 1px solid var(--border); cursor: pointer;" onclick="editPrompt('${p.id}')">
-                    <td style="padding: 12px; font-weight: 600; color: var(--primary);">${p.name}</td>
-                    <td style="padding: 12px; color: var(--muted);">${p.description || '-'}</td>
-                    <td style="padding: 12px;">
-                        <button class="btn btn-outline" style="padding: 6px 12px; font-size: 0.75rem;" onclick="event.stopPropagation(); editPrompt('${p.id}')">Edit</button>
-                        ${!p.is_default ? `<button class="btn" style="padding: 6px 12px; font-size: 0.75rem; background: var(--destructive); color: white;" onclick="event.stopPropagation(); deletePrompt('${p.id}')">Delete</button>` : ''}
-                    </td>
-                </tr>
-            `).join('');
+
+            // Drop placeholder rows and rows for deleted prompts
+            for (const child of Array.from(tbody.children)) {
+                if (!child.dataset.id) child.remove();
+            }
+            const ids = new Set(prompts.map(p => p.id));
+            for (const [id, tr] of promptRowCache) {
+                if (!ids.has(id)) { tr.remove(); promptRowCache.delete(id); }
+            }
+
+            let prev = null;
+            for (const p of prompts) {
+                let tr = promptRowCache.get(p.id);
+                if (!tr) { tr = buildPromptRow(); promptRowCache.set(p.id, tr); }
+                // Cheap change detection: skip untouched rows entirely
+                const hash = p.id + ':' + p.name + ':' + (p.description || '') + ':' + (p.is_default ? 1 : 0);
+                if (tr.dataset.hash !== hash) {
+                    tr.dataset.id = p.id;
+                    tr.dataset.hash = hash;
+                    tr.children[0].textContent = p.name;
+                    tr.children[1].textContent = p.description || '-';
+                    tr.children[2].lastElementChild.style.display = p.is_default ? 'none' : '';
+                }
+                // Keep document order in sync with the data order
+                if (prev ? tr.previousElementSibling !== prev : tbody.firstElementChild !== tr) {
+                    tbody.insertBefore(tr, prev ? prev.nextElementSibling : tbody.firstElementChild);
+                }
+                prev = tr;
+            }
         }
         
         function editPrompt(promptId) {
-            const prompt = allPrompts.find(p => p.id === promptId);
+            const prompt = promptsById.get(promptId);
             if (!prompt) return;
             
             if (prompt.is_default) {
@@ -1534,44 +2141,49 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
                 return;
             }
             
+            const els = getPromptEls();
             currentPromptId = promptId;
-            document.getElementById('currentPromptId').value = promptId;
-            document.getElementById('promptName').value = prompt.name;
-            document.getElementById('promptDescription').value = prompt.description || '';
-            document.getElementById('promptText').value = prompt.prompt_text;
-            document.getElementById('promptTags').value = (prompt.tags || []).join(', ');
+            els.id.value = promptId;
+            els.name.value = prompt.name;
+            els.description.value = prompt.description || '';
+            els.text.value = prompt.prompt_text;
+            els.tags.value = (prompt.tags || []).join(', ');
             
-            document.querySelector('.card-header + div + div + div').scrollIntoView({ behavior: 'smooth' });
+            // Instant jump to the stable editor id — no sibling-chain
+            // selector walk and no smooth-scroll animation frames
+            els.editor.scrollIntoView({ block: 'start' });
         }
         
         async function savePrompt() {
-            const name = document.getElementById('promptName').value.trim();
-            const text = document.getElementById('promptText').value.trim();
-            
+            const els = getPromptEls();
+            const name = els.name.value.trim();
+            const text = els.text.value.trim();
+
             if (!name || !text) {
                 showPromptMessage('Name and prompt text are required', 'error');
                 return;
             }
-            
+
             const data = {
                 id: currentPromptId,
                 name: name,
-                description: document.getElementById('promptDescription').value.trim(),
+                description: els.description.value.trim(),
                 prompt_text: text,
-                tags: document.getElementById('promptTags').value.split(',').map(t => t.trim()).filter(Boolean)
+                tags: els.tags.value.split(',').map(t => t.trim()).filter(Boolean)
             };
             
             try {
+                // Blob body: the browser hands the bytes to the network
+                // stack and streams them without another string copy
                 const response = await fetch('/api/prompts', {
                     method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify(data)
+                    body: new Blob([JSON.stringify(data)], {type: 'application/json'})
                 });
                 
                 const result = await response.json();
                 if (result.success) {
                     showPromptMessage('Prompt saved successfully!', 'success');
-                    loadPrompts();
+                    loadPrompts(true);
                     clearPromptEditor();
                 } else {
                     showPromptMessage('Error: ' + result.error, 'error');
@@ -1590,7 +2202,7 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
                 
                 if (data.success) {
                     showPromptMessage('Prompt deleted', 'success');
-                    loadPrompts();
+                    loadPrompts(true);
                     clearPromptEditor();
                 } else {
                     showPromptMessage('Error: ' + data.error, 'error');
@@ -1601,12 +2213,13 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
         }
         
         function clearPromptEditor() {
+            const els = getPromptEls();
             currentPromptId = null;
-            document.getElementById('currentPromptId').value = '';
-            document.getElementById('promptName').value = '';
-            document.getElementById('promptDescription').value = '';
-            document.getElementById('promptText').value = '';
-            document.getElementById('promptTags').value = '';
+            els.id.value = '';
+            els.name.value = '';
+            els.description.value = '';
+            els.text.value = '';
+            els.tags.value = '';
         }
         
         function exportPrompts() {
@@ -1616,55 +2229,70 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
         async function importPrompts(event) {
             const file = event.target.files[0];
             if (!file) return;
-            
-            const reader = new FileReader();
-            reader.onload = async function(e) {
-                try {
-                    const prompts = JSON.parse(e.target.result);
-                    const response = await fetch('/api/prompts/import', {
-                        method: 'POST',
-                        headers: {'Content-Type': 'application/json'},
-                        body: JSON.stringify({ prompts: prompts })
-                    });
-                    
-                    const data = await response.json();
-                    if (data.success) {
-                        showPromptMessage(`Imported ${data.imported} prompts!`, 'success');
-                        loadPrompts();
-                    } else {
-                        showPromptMessage('Import error: ' + data.error, 'error');
-                    }
-                } catch (err) {
-                    showPromptMessage('Invalid file: ' + err.message, 'error');
+
+            try {
+                // Upload the file blob as-is: the browser streams it from
+                // disk and the server parses once. No FileReader string,
+                // no main-thread JSON.parse, no re-stringify round-trip —
+                // so there is nothing left to offload to a parse worker;
+                // the UI thread only awaits the fetch.
+                const response = await fetch('/api/prompts/import', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: file
+                });
+
+                const data = await response.json();
+                if (data.success) {
+                    showPromptMessage(`Imported ${data.imported} prompts!`, 'success');
+                    loadPrompts(true);
+                } else {
+                    showPromptMessage('Import error: ' + data.error, 'error');
                 }
-            };
-            reader.readAsText(file);
+            } catch (err) {
+                showPromptMessage('Invalid file: ' + err.message, 'error');
+            }
             event.target.value = '';
         }
         
         function showPromptMessage(text, type) {
             const container = document.getElementById('promptMessage');
             if (!container) return;
-            
-            const bgColor = type === 'success' ? 'rgba(34, 197, 94, 0.1)' : 'rgba(239, 68, 68, 0.1)';
-            const borderColor = type === 'success' ? 'rgba(34, 197, 94, 0.2)' : 'rgba(239, 68, 68, 0.2)';
-            const textColor = type === 'success' ? 'var(--success)' : 'var(--destructive)';
-            
-            container.innerHTML = `<div style="background: ${bgColor}; border: 1px solid ${borderColor}; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; color: ${textColor};">${text}</div>`;
-            setTimeout(() => { container.innerHTML = ''; }, 3000);
+
+            const msg = container.firstElementChild;
+            msg.textContent = text;
+            msg.className = 'prompt-msg ' + type;
+            // Force a reflow so the fade restarts even when a message
+            // is already showing
+            void msg.offsetWidth;
+            msg.classList.add('show');
         }
         
         // Load prompts when Prompts tab is opened
         document.addEventListener('DOMContentLoaded', function() {
-            loadPrompts();
+            // One delegated listener for the whole prompts table — rows
+            // come and go across renders without touching listeners
+            document.getElementById('promptsTableBody').addEventListener('click', (e) => {
+                const tr = e.target.closest('tr');
+                if (!tr || !tr.dataset.id) return;
+                const btn = e.target.closest('button');
+                if (btn && btn.dataset.action === 'delete') {
+                    deletePrompt(tr.dataset.id);
+                } else {
+                    editPrompt(tr.dataset.id);
+                }
+            });
+            document.getElementById('promptSearch')
+                .addEventListener('input', debounce(filterPrompts, 80));
+            // Paint the last-known prompts/status immediately; the
+            // network revalidation waits until the tab is first opened
+            hydrateFromLocalStorage();
         });
         
 
         // Global state
         let currentScenarios = [];
         let currentReport = null;
-        let impactChart = null;
-        let distributionChart = null;
         
         // Data cache for state management
         let dataCache = {
@@ -1686,38 +2314,60 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
             prompts_list: []
         };
         
-        // Load available prompts from Prompts tab
+        let availablePromptsETag = null;
+
+        function populatePromptSelect(prompts) {
+            const select = getStatusEls().promptSelect;
+
+            // Build the options off-DOM and swap them in atomically:
+            // one reflow instead of an innerHTML parse plus one
+            // appendChild-against-the-live-select per prompt
+            const frag = document.createDocumentFragment();
+            frag.appendChild(new Option('⚠ Select a prompt (required)', ''));
+            for (const prompt of prompts) {
+                frag.appendChild(new Option(
+                    prompt.name + (prompt.is_default ? ' (Default)' : ''),
+                    prompt.id
+                ));
+            }
+            select.replaceChildren(frag);
+
+            // Auto-select default prompt (keep any existing selection)
+            const defaultPrompt = prompts.find(p => p.is_default);
+            if (defaultPrompt && !select.value) {
+                select.value = defaultPrompt.id;
+                updatePromptInfo();
+            }
+        }
+
+        // Stale-while-revalidate: paint the dropdown from the
+        // localStorage snapshot immediately, then revalidate with the
+        // stored ETag — an unchanged library answers a bodyless 304 and
+        // the options are left alone
         async function loadAvailablePrompts() {
             try {
-                const response = await fetch('/api/prompts');
+                const stored = JSON.parse(localStorage.getItem(PROMPTS_LS_KEY) || 'null');
+                if (stored && Array.isArray(stored.prompts) && stored.prompts.length) {
+                    promptCache.prompts_list = stored.prompts;
+                    promptCache.prompts_loaded = true;
+                    availablePromptsETag = stored.etag || null;
+                    populatePromptSelect(stored.prompts);
+                }
+            } catch (e) { /* corrupt snapshot — the fetch repopulates */ }
+
+            try {
+                const headers = {};
+                if (availablePromptsETag) headers['If-None-Match'] = availablePromptsETag;
+                const response = await fetch('/api/prompts', { headers });
+                if (response.status === 304) return;  // dropdown is current
+
                 const data = await response.json();
-                
                 if (data.success) {
+                    availablePromptsETag = response.headers.get('ETag');
                     promptCache.prompts_list = data.prompts;
                     promptCache.prompts_loaded = true;
-                    
-                    // Populate dropdown
-                    const select = document.getElementById('promptSelect');
-                    select.innerHTML = '<option value="">⚠ Select a prompt (required)</option>';
-                    
-                    data.prompts.forEach(prompt => {
-                        const option = document.createElement('option');
-                        option.value = prompt.id;
-                        option.textContent = prompt.name;
-                        if (prompt.is_default) {
-                            option.textContent += ' (Default)';
-                        }
-                        select.appendChild(option);
-                    });
-                    
-                    // Auto-select default prompt
-                    const defaultPrompt = data.prompts.find(p => p.is_default);
-                    if (defaultPrompt) {
-                        select.value = defaultPrompt.id;
-                        updatePromptInfo();
-                    }
-                    
-                    console.log('✓ Loaded', data.prompts.length, 'prompts');
+                    populatePromptSelect(data.prompts);
+                    log('✓ Loaded', data.prompts.length, 'prompts');
                 } else {
                     console.error('Failed to load prompts:', data.error);
                 }
@@ -1728,17 +2378,17 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
         
         // Update prompt info when selection changes
         function updatePromptInfo() {
-            const select = document.getElementById('promptSelect');
-            const promptId = select.value;
-            const infoDiv = document.getElementById('promptInfo');
-            const descDiv = document.getElementById('promptDescription');
-            
+            const els = getStatusEls();
+            const promptId = els.promptSelect.value;
+            const infoDiv = els.promptInfo;
+            const descDiv = els.promptInfoDesc;
+
             if (!promptId) {
                 infoDiv.style.display = 'none';
                 promptCache.selected_prompt_id = null;
                 promptCache.selected_prompt_name = null;
                 promptCache.selected_prompt_description = null;
-                document.getElementById('platformActivePrompt').textContent = '-';
+                els.platformActivePrompt.textContent = '-';
                 return;
             }
             
@@ -1754,38 +2404,36 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
                 descDiv.textContent = prompt.description || 'No description available';
                 
                 // Update Platform Status
-                document.getElementById('platformActivePrompt').textContent = prompt.name;
+                els.platformActivePrompt.textContent = prompt.name;
                 
-                console.log('✓ Selected prompt:', prompt.name);
+                log('✓ Selected prompt:', prompt.name);
             }
         }
         
-        // Show data message (success or error)
+        // Show data message (success or error) — class toggles on a
+        // persistent element instead of style strings through innerHTML
         function showDataMessage(message, type) {
             const container = document.getElementById('dataLoadMessage');
             if (!container) return;
-            
-            const bgColor = type === 'success' ? 'rgba(34, 197, 94, 0.1)' : 'rgba(239, 68, 68, 0.1)';
-            const borderColor = type === 'success' ? 'rgba(34, 197, 94, 0.2)' : 'rgba(239, 68, 68, 0.2)';
-            const textColor = type === 'success' ? 'var(--success)' : 'var(--destructive)';
-            const icon = type === 'success' ? '✓' : '✗';
-            
-            container.innerHTML = `
-                <div style="background: ${bgColor}; border: 1px solid ${borderColor}; padding: 1rem; border-radius: 8px; color: ${textColor}; white-space: pre-line;">
-                    <strong>${icon} ${message}</strong>
-                </div>
-            `;
+
+            const msg = container.firstElementChild;
+            msg.textContent = (type === 'success' ? '✓ ' : '✗ ') + message;
+            msg.className = 'data-msg ' + type;
+            msg.hidden = false;
         }
         
         // Confirm & Load Data function
         async function confirmAndLoadData() {
             const modelId = document.getElementById('modelIdInput').value.trim();
             const applyLimit = document.getElementById('applyLimitCheck').checked;
-            const limitInput = document.getElementById('limitInput').value;
-            const limit = parseInt(limitInput);
-            
+            // Coerce once: | 0 handles the numeric-only input faster than
+            // parseInt and yields 0 (rejected below) for junk input
+            const limit = applyLimit
+                ? (Number(document.getElementById('limitInput').value) | 0)
+                : null;
+
             // Validate
-            if (applyLimit && (!limit || limit <= 0)) {
+            if (applyLimit && limit <= 0) {
                 showDataMessage('Please enter a valid limit (positive number)', 'error');
                 return;
             }
@@ -1794,7 +2442,7 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
             btn.disabled = true;
             btn.innerHTML = '<div class="spinner"></div> Loading Data...';
             
-            console.log('📥 Confirming and loading data:', {modelId, applyLimit, limit});
+            log('📥 Confirming and loading data:', {modelId, applyLimit, limit});
             
             try {
                 const response = await fetch('/api/data/load', {
@@ -1803,12 +2451,12 @@ Generate 3 stress scenarios for interest rate risk, credit spreads, and FX rates
                     body: JSON.stringify({
                         model_id: modelId || null,
                         apply_limit: applyLimit,
-                        limit: applyLimit ? limit : null
+                        limit: limit
                     })
                 });
                 
                 const data = await response.json();
-                console.log('Response:', data);
+                log('Response:', data);
                 
                 if (data.success) {
                     // Update cache
@@ -1829,10 +2477,12 @@ Contracts: ${data.contracts_count.toLocaleString()}
 Counterparties: ${data.counterparties_count.toLocaleString()}`;
                     
                     showDataMessage(message, 'success');
-                    updateDataStatusPanel();
-                    updateGenerateDataStatus();
+                    scheduleStatusRefresh();
+                    try {
+                        localStorage.setItem(DATA_CACHE_LS_KEY, JSON.stringify(dataCache));
+                    } catch (e) { /* best-effort */ }
                     
-                    console.log('✓ Data cached successfully:', dataCache);
+                    log('✓ Data cached successfully:', dataCache);
                 } else {
                     showDataMessage('Error loading data: ' + data.error, 'error');
                     console.error('Data loading error:', data);
@@ -1846,85 +2496,107 @@ Counterparties: ${data.counterparties_count.toLocaleString()}`;
             }
         }
         
+        // Status panels: element refs are resolved once, and refreshes
+        // are coalesced into one write pass per animation frame so
+        // back-to-back updates cost a single layout instead of several
+        let statusEls = null;
+        let statusRafPending = false;
+
+        function getStatusEls() {
+            if (!statusEls) {
+                statusEls = {
+                    loaded: document.getElementById('dataLoadedStatus'),
+                    modelId: document.getElementById('currentModelId'),
+                    limit: document.getElementById('currentLimit'),
+                    riskFactors: document.getElementById('riskFactorsCount'),
+                    contracts: document.getElementById('contractsCount'),
+                    counterparties: document.getElementById('counterpartiesCount'),
+                    timestamp: document.getElementById('loadTimestamp'),
+                    generateIndicator: document.getElementById('generateDataStatus'),
+                    generateStatusLoaded: document.getElementById('generateStatusLoaded'),
+                    generateStatusEmpty: document.getElementById('generateStatusEmpty'),
+                    generateStatusSummary: document.getElementById('generateStatusSummary'),
+                    generateContracts: document.getElementById('generateContractsCount'),
+                    generateCounterparties: document.getElementById('generateCounterpartiesCount'),
+                    generateRiskFactors: document.getElementById('generateRiskFactorsCount'),
+                    promptSelect: document.getElementById('promptSelect'),
+                    promptInfo: document.getElementById('promptInfo'),
+                    promptInfoDesc: document.getElementById('promptDescription'),
+                    platformActivePrompt: document.getElementById('platformActivePrompt'),
+                    sliderValue: document.getElementById('sliderValue'),
+                    numScenarios: document.getElementById('numScenarios')
+                };
+            }
+            return statusEls;
+        }
+
+        // All status-panel writes funnel through here: both updaters run
+        // back-to-back inside one animation frame, and neither performs
+        // a layout read, so the browser coalesces the whole refresh into
+        // a single style/layout pass no matter how many callers fire
+        function scheduleStatusRefresh() {
+            if (statusRafPending) return;
+            statusRafPending = true;
+            requestAnimationFrame(() => {
+                statusRafPending = false;
+                updateDataStatusPanel();
+                updateGenerateDataStatus();
+            });
+        }
+
         // Update Data Status Panel
         function updateDataStatusPanel() {
+            const els = getStatusEls();
             if (dataCache.loaded) {
-                document.getElementById('dataLoadedStatus').textContent = 'Yes';
-                document.getElementById('dataLoadedStatus').style.color = 'var(--success)';
-                
-                document.getElementById('currentModelId').textContent = dataCache.model_id || 'All';
-                document.getElementById('currentLimit').textContent = dataCache.limit ? dataCache.limit.toLocaleString() : 'No limit';
-                document.getElementById('riskFactorsCount').textContent = dataCache.risk_factors_count;
-                document.getElementById('contractsCount').textContent = dataCache.contracts_count.toLocaleString();
-                document.getElementById('counterpartiesCount').textContent = dataCache.counterparties_count.toLocaleString();
-                
+                els.loaded.textContent = 'Yes';
+                els.loaded.style.color = 'var(--success)';
+
+                els.modelId.textContent = dataCache.model_id || 'All';
+                els.limit.textContent = dataCache.limit ? dataCache.limit.toLocaleString() : 'No limit';
+                els.riskFactors.textContent = dataCache.risk_factors_count;
+                els.contracts.textContent = dataCache.contracts_count.toLocaleString();
+                els.counterparties.textContent = dataCache.counterparties_count.toLocaleString();
+
                 if (dataCache.timestamp) {
                     const date = new Date(dataCache.timestamp);
-                    document.getElementById('loadTimestamp').textContent = date.toLocaleString();
+                    els.timestamp.textContent = date.toLocaleString();
                 }
             } else {
-                document.getElementById('dataLoadedStatus').textContent = 'No';
-                document.getElementById('dataLoadedStatus').style.color = 'var(--muted)';
+                els.loaded.textContent = 'No';
+                els.loaded.style.color = 'var(--muted)';
             }
         }
         
-        // Update Generate tab data status indicator
+        // Update Generate tab data status indicator. Both state
+        // subtrees exist in the markup; this just flips classes/hidden
+        // and fills in the text — no HTML parse, no style strings
         function updateGenerateDataStatus() {
-            const indicator = document.getElementById('generateDataStatus');
+            const els = getStatusEls();
+            const indicator = els.generateIndicator;
             if (!indicator) return;
-            
-            if (dataCache.loaded) {
-                indicator.style.background = 'rgba(34, 197, 94, 0.1)';
-                indicator.style.borderColor = 'rgba(34, 197, 94, 0.2)';
-                indicator.innerHTML = `
-                    <div style="display: flex; align-items: center; justify-content: space-between;">
-                        <div>
-                            <strong style="color: var(--success);">✓ Data Loaded:</strong>
-                            <span style="color: var(--foreground);">
-                                Model ${dataCache.model_id || 'All'} | 
-                                ${dataCache.contracts_count.toLocaleString()} contracts | 
-                                ${dataCache.counterparties_count.toLocaleString()} counterparties |
-                                ${dataCache.risk_factors_count} risk factors
-                            </span>
-                        </div>
-                        <button type="button" class="btn btn-outline" onclick="switchTab('data')" style="padding: 6px 12px; font-size: 0.875rem;">
-                            Reload Data
-                        </button>
-                    </div>
-                `;
-                
+
+            const loaded = dataCache.loaded;
+            indicator.classList.toggle('status-loaded', loaded);
+            indicator.classList.toggle('status-empty', !loaded);
+            els.generateStatusLoaded.hidden = !loaded;
+            els.generateStatusEmpty.hidden = loaded;
+
+            if (loaded) {
+                els.generateStatusSummary.textContent =
+                    `Model ${dataCache.model_id || 'All'} | ` +
+                    `${dataCache.contracts_count.toLocaleString()} contracts | ` +
+                    `${dataCache.counterparties_count.toLocaleString()} counterparties | ` +
+                    `${dataCache.risk_factors_count} risk factors`;
+
                 // Update Platform Status panel counts
-                const contractsEl = document.getElementById('generateContractsCount');
-                const counterpartiesEl = document.getElementById('generateCounterpartiesCount');
-                const riskFactorsEl = document.getElementById('generateRiskFactorsCount');
-                
-                if (contractsEl) contractsEl.textContent = dataCache.contracts_count.toLocaleString();
-                if (counterpartiesEl) counterpartiesEl.textContent = dataCache.counterparties_count.toLocaleString();
-                if (riskFactorsEl) riskFactorsEl.textContent = dataCache.risk_factors_count;
-                
+                if (els.generateContracts) els.generateContracts.textContent = dataCache.contracts_count.toLocaleString();
+                if (els.generateCounterparties) els.generateCounterparties.textContent = dataCache.counterparties_count.toLocaleString();
+                if (els.generateRiskFactors) els.generateRiskFactors.textContent = dataCache.risk_factors_count;
             } else {
-                indicator.style.background = 'rgba(239, 68, 68, 0.1)';
-                indicator.style.borderColor = 'rgba(239, 68, 68, 0.2)';
-                indicator.innerHTML = `
-                    <div style="display: flex; align-items: center; justify-content: space-between;">
-                        <div>
-                            <strong style="color: var(--destructive);">⚠ No Data Loaded</strong>
-                            <span style="color: var(--muted); font-size: 0.875rem;">Please load data before generating scenarios</span>
-                        </div>
-                        <button type="button" class="btn btn-primary" onclick="switchTab('data')" style="padding: 6px 12px; font-size: 0.875rem;">
-                            Go to Data Loading
-                        </button>
-                    </div>
-                `;
-                
                 // Show dashes when no data loaded
-                const contractsEl = document.getElementById('generateContractsCount');
-                const counterpartiesEl = document.getElementById('generateCounterpartiesCount');
-                const riskFactorsEl = document.getElementById('generateRiskFactorsCount');
-                
-                if (contractsEl) contractsEl.textContent = '-';
-                if (counterpartiesEl) counterpartiesEl.textContent = '-';
-                if (riskFactorsEl) riskFactorsEl.textContent = '-';
+                if (els.generateContracts) els.generateContracts.textContent = '-';
+                if (els.generateCounterparties) els.generateCounterparties.textContent = '-';
+                if (els.generateRiskFactors) els.generateRiskFactors.textContent = '-';
             }
         }
         
@@ -1935,28 +2607,111 @@ Counterparties: ${data.counterparties_count.toLocaleString()}`;
             
             document.querySelector(`[data-tab="${tabId}"]`).classList.add('active');
             document.getElementById(`${tabId}-content`).classList.add('active');
+
+            // Cold loads skip the prompts fetch entirely; the first
+            // visit to the tab triggers it (then the ETag path takes over)
+            if (tabId === 'prompts' && !promptsLoadedOnce) {
+                promptsLoadedOnce = true;
+                loadPrompts();
+            }
+
+            // Deferred results render from the last generation
+            if (tabId === 'results') {
+                renderPendingResults();
+            }
         }
         
+        // Trailing-edge debounce for high-frequency input events
+        function debounce(fn, ms) {
+            let timer = null;
+            return (...args) => {
+                clearTimeout(timer);
+                timer = setTimeout(() => fn(...args), ms);
+            };
+        }
+
         // Update slider value
         function updateSliderValue() {
-            document.getElementById('sliderValue').textContent = document.getElementById('numScenarios').value;
+            const els = getStatusEls();
+            els.sliderValue.textContent = els.numScenarios.value;
         }
         
+        // Sync the status panels with the server-side dataset cache —
+        // the localStorage snapshot can outlive a server restart
+        async function probeDataStatus() {
+            try {
+                const response = await fetch('/api/data/status');
+                const status = await response.json();
+                if (status.loaded) {
+                    dataCache = {
+                        loaded: true,
+                        model_id: status.model_id,
+                        limit: status.limit,
+                        risk_factors_count: status.risk_factors_count,
+                        contracts_count: status.contracts_count,
+                        counterparties_count: status.counterparties_count,
+                        timestamp: status.timestamp
+                    };
+                } else {
+                    // Server restarted since the snapshot was taken —
+                    // drop the stale "loaded" claim everywhere
+                    dataCache = {
+                        loaded: false,
+                        model_id: null,
+                        limit: null,
+                        risk_factors_count: 0,
+                        counterparties_count: 0,
+                        contracts_count: 0,
+                        timestamp: null
+                    };
+                    try { localStorage.removeItem(DATA_CACHE_LS_KEY); } catch (e) {}
+                }
+                scheduleStatusRefresh();
+            } catch (e) { /* probe is best-effort */ }
+        }
+
+        // Hoisted: a fresh literal per change event is pointless
+        const SCENARIO_TYPE_DESCRIPTIONS = {
+            'stress': 'Deterministic scenarios based on specific events',
+            'stochastic': 'Probabilistic scenarios from statistical models',
+            'both': 'Mix of deterministic and probabilistic scenarios'
+        };
+
+        // One-time listener wiring, run at DOMContentLoaded so the
+        // nodes exist no matter where the script ends up in the page.
+        // Handlers never call preventDefault, so they are passive.
+        function bindUI() {
+            // The range input fires per pixel of drag; one write per
+            // ~frame is plenty for a text label
+            document.getElementById('numScenarios')
+                .addEventListener('input', debounce(updateSliderValue, 20), { passive: true });
+
+            // One delegated listener covers every View Details button —
+            // scenario cards carry no handlers of their own
+            document.getElementById('resultsContainer').addEventListener('click', (e) => {
+                const btn = e.target.closest('.toggle-btn');
+                if (btn) toggleShocks(btn.dataset.idx);
+            }, { passive: true });
+
+            // Update type description
+            document.getElementById('scenarioType').addEventListener('change', function() {
+                document.getElementById('typeDescription').textContent =
+                    SCENARIO_TYPE_DESCRIPTIONS[this.value];
+            }, { passive: true });
+        }
+
         // Initialize on page load
         document.addEventListener('DOMContentLoaded', function() {
-            updateGenerateDataStatus();
-            loadAvailablePrompts();
-            console.log('ALM Scenario Generator initialized');
-        });
-        
-        // Update type description
-        document.getElementById('scenarioType').addEventListener('change', function() {
-            const descriptions = {
-                'stress': 'Deterministic scenarios based on specific events',
-                'stochastic': 'Probabilistic scenarios from statistical models',
-                'both': 'Mix of deterministic and probabilistic scenarios'
-            };
-            document.getElementById('typeDescription').textContent = descriptions[this.value];
+            bindUI();
+            scheduleStatusRefresh();
+            // Independent bootstrap fetches go out concurrently; each
+            // renders as it lands and the rAF batcher coalesces writes.
+            // Deliberately NOT funneled through a batched POST endpoint:
+            // the prompts fetch rides its ETag (usually a bodyless 304)
+            // and a combined uncacheable POST would resend the full
+            // library on every load to save one already-parallel RTT.
+            Promise.all([loadAvailablePrompts(), probeDataStatus()]);
+            log('ALM Scenario Generator initialized');
         });
         
         // Set example
@@ -2099,335 +2854,467 @@ Counterparties: ${data.counterparties_count.toLocaleString()}`;
             }, 100);
         }
         
-        // Display results
+        // Tiny hyperscript helper: building nodes directly skips the
+        // HTML tokenizer pass that dominates large innerHTML
+        // assignments, and strings become text nodes — scenario names
+        // and descriptions never reach the parser
+        function h(tag, props, ...children) {
+            const el = document.createElement(tag);
+            if (props) {
+                for (const [key, value] of Object.entries(props)) {
+                    if (key === 'className') el.className = value;
+                    else if (key === 'onclick') el.onclick = value;
+                    else el.setAttribute(key, value);
+                }
+            }
+            for (const child of children) {
+                if (child == null) continue;
+                el.append(child);
+            }
+            return el;
+        }
+
+        // Results render lazily: generation just records the payload,
+        // and the DOM work happens when the Reporting tab is actually
+        // looked at. While the user stays on Generate, the fragment is
+        // prebuilt (not mounted) in idle time so the first switch to
+        // Reporting mounts instantly without competing with the
+        // visible tab for main-thread time.
+        let pendingResults = null;
+        let prebuiltFrag = null;
+
+        const idle = window.requestIdleCallback
+            ? (cb) => window.requestIdleCallback(cb, { timeout: 2000 })
+            : (cb) => setTimeout(cb, 200);
+
+        function buildResultsFragment({ scenarios, report, csvFile }) {
+            const frag = generateResultsFragment(scenarios, report, csvFile);
+            // Canvas IDs are location-specific so chart instances in
+            // the registry stay distinct
+            frag.querySelector('#impactChart').id = 'impactChartResults';
+            frag.querySelector('#distributionChart').id = 'distributionChartResults';
+            return frag;
+        }
+
+        // Display results (shown ONLY in the Reporting tab)
         function displayResults(scenarios, report, csvFile) {
-            const html = generateResultsHTML(scenarios, report, csvFile);
-            
-            // Results ONLY shown in Reporting tab (not inline in Generate)
-            
-            // Update Reporting tab with unique chart IDs
-            const resultsContainer = document.getElementById('resultsContainer');
-            if (resultsContainer) {
-                resultsContainer.innerHTML = html;
-                
-                // Update canvas IDs in Reporting tab to be unique
-                const resultsImpactCanvas = resultsContainer.querySelector('#impactChart');
-                const resultsDistCanvas = resultsContainer.querySelector('#distributionChart');
-                if (resultsImpactCanvas) resultsImpactCanvas.id = 'impactChartResults';
-                if (resultsDistCanvas) resultsDistCanvas.id = 'distributionChartResults';
+            pendingResults = { scenarios, report, csvFile };
+            prebuiltFrag = null;
+            if (document.getElementById('results-content').classList.contains('active')) {
+                renderPendingResults();
+            } else {
+                const payload = pendingResults;
+                idle(() => {
+                    if (pendingResults === payload && !prebuiltFrag) {
+                        prebuiltFrag = buildResultsFragment(payload);
+                    }
+                });
             }
-            
-            // Initialize charts in both locations after DOM update
-            setTimeout(() => {
-                // Charts for inline results (Generate tab)
-                initCharts(scenarios, report, 'inline');
-                
-                // Charts for Reporting tab (with updated IDs)
-                initCharts(scenarios, report, 'results');
-            }, 150);
-        }
-        
-        // Generate results HTML
-        function generateResultsHTML(scenarios, report, csvFile) {
-            let html = `
-                <!-- Success Banner -->
-                <div class="success-banner">
-                    <div class="success-content">
-                        <div class="success-icon">✓</div>
-                        <div class="success-text">
-                            <h4>Scenarios Generated Successfully</h4>
-                            <p>${report.totalScenarios} scenarios with ${report.totalShocks} total shocks</p>
-                        </div>
-                    </div>
-                    <div class="success-actions">
-                        <button class="btn btn-outline" onclick="exportCSV()">
-                            📥 Export CSV
-                        </button>
-                    </div>
-                </div>
-                
-                <!-- Stats Grid -->
-                <div class="stats-grid">
-                    <div class="stat-card">
-                        <div class="stat-header">
-                            <div>
-                                <div class="stat-label">Total Scenarios</div>
-                                <div class="stat-value">${report.totalScenarios}</div>
-                                <div class="stat-subtitle">${report.stressScenarios} stress, ${report.stochasticScenarios} stochastic</div>
-                            </div>
-                            <div class="stat-icon">🎯</div>
-                        </div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-header">
-                            <div>
-                                <div class="stat-label">Total Shocks</div>
-                                <div class="stat-value">${report.totalShocks}</div>
-                                <div class="stat-subtitle">Across all scenarios</div>
-                            </div>
-                            <div class="stat-icon">⚡</div>
-                        </div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-header">
-                            <div>
-                                <div class="stat-label">Avg. NII Impact</div>
-                                <div class="stat-value negative">${report.impactSummary.avgNiiImpact}%</div>
-                                <div class="stat-subtitle">Net interest income</div>
-                            </div>
-                            <div class="stat-icon">📉</div>
-                        </div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-header">
-                            <div>
-                                <div class="stat-label">Max VaR</div>
-                                <div class="stat-value negative">${report.impactSummary.maxVaR}M</div>
-                                <div class="stat-subtitle">Value at Risk</div>
-                            </div>
-                            <div class="stat-icon">📊</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Charts -->
-                <div class="charts-grid">
-                    <div class="chart-card">
-                        <div class="chart-title">Scenario Impact Analysis</div>
-                        <div class="chart-container">
-                            <canvas id="impactChart"></canvas>
-                        </div>
-                    </div>
-                    <div class="chart-card">
-                        <div class="chart-title">Risk Factor Distribution</div>
-                        <div class="chart-container">
-                            <canvas id="distributionChart"></canvas>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Scenarios List -->
-                <h3 style="margin-bottom: 1rem;">Generated Scenarios</h3>
-                <div class="scenarios-list">
-            `;
-            
+        }
+
+        function renderPendingResults() {
+            if (!pendingResults) return;
+            const { scenarios, report } = pendingResults;
+            const frag = prebuiltFrag || buildResultsFragment(pendingResults);
+            pendingResults = null;
+            prebuiltFrag = null;
+
+            const resultsContainer = document.getElementById('resultsContainer');
+            if (!resultsContainer) return;
+
+            // One mount, no reparse of the assembled markup. The view
+            // is assembled entirely in a detached DocumentFragment, so
+            // this single replaceChildren is the only live-tree
+            // mutation — detaching the container first would not save
+            // any further style invalidations
+            resultsContainer.replaceChildren(frag);
+
+            // Charts go in on the next frame, once the canvases have
+            // laid out — no arbitrary 150ms delay
+            requestAnimationFrame(() => initCharts(scenarios, report, 'results'));
+        }
+
+        // Build the results view as a DocumentFragment
+        function generateResultsFragment(scenarios, report, csvFile) {
+            const frag = document.createDocumentFragment();
+
+            frag.append(
+                h('div', {className: 'success-banner'},
+                    h('div', {className: 'success-content'},
+                        h('div', {className: 'success-icon'}, '✓'),
+                        h('div', {className: 'success-text'},
+                            h('h4', null, 'Scenarios Generated Successfully'),
+                            h('p', null, `${report.totalScenarios} scenarios with ${report.totalShocks} total shocks`))),
+                    h('div', {className: 'success-actions'},
+                        h('button', {className: 'btn btn-outline', onclick: exportCSV}, '📥 Export CSV'))));
+
+            const statCard = (label, value, subtitle, icon, negative) =>
+                h('div', {className: 'stat-card'},
+                    h('div', {className: 'stat-header'},
+                        h('div', null,
+                            h('div', {className: 'stat-label'}, label),
+                            h('div', {className: negative ? 'stat-value negative' : 'stat-value'}, value),
+                            h('div', {className: 'stat-subtitle'}, subtitle)),
+                        h('div', {className: 'stat-icon'}, icon)));
+
+            frag.append(
+                h('div', {className: 'stats-grid'},
+                    statCard('Total Scenarios', String(report.totalScenarios),
+                             `${report.stressScenarios} stress, ${report.stochasticScenarios} stochastic`, '🎯', false),
+                    statCard('Total Shocks', String(report.totalShocks), 'Across all scenarios', '⚡', false),
+                    statCard('Avg. NII Impact', `${report.impactSummary.avgNiiImpact}%`, 'Net interest income', '📉', true),
+                    statCard('Max VaR', `${report.impactSummary.maxVaR}M`, 'Value at Risk', '📊', true)));
+
+            frag.append(
+                h('div', {className: 'charts-grid'},
+                    h('div', {className: 'chart-card'},
+                        h('div', {className: 'chart-title'}, 'Scenario Impact Analysis'),
+                        h('div', {className: 'chart-container'}, h('canvas', {id: 'impactChart'}))),
+                    h('div', {className: 'chart-card'},
+                        h('div', {className: 'chart-title'}, 'Risk Factor Distribution'),
+                        h('div', {className: 'chart-container'}, h('canvas', {id: 'distributionChart'})))));
+
+            frag.append(h('h3', {style: 'margin-bottom: 1rem;'}, 'Generated Scenarios'));
+
+            // Windowed rendering: the first screenful of cards is built
+            // eagerly, the rest start as fixed-height placeholders that
+            // become real cards as they scroll into view — layout cost
+            // stays bounded no matter how many scenarios were requested
+            const list = h('div', {className: 'scenarios-list'});
+            const observer = scenarios.length > SCENARIO_EAGER_COUNT
+                ? makeScenarioObserver(scenarios) : null;
             scenarios.forEach((s, i) => {
-                const impact = s.impact || {nii: 0, eve: 0, var: 0};
-                html += `
-                    <div class="scenario-card">
-                        <div class="scenario-header">
-                            <div class="scenario-top">
-                                <div>
-                                    <div class="scenario-meta">
-                                        <span class="scenario-id">SCN_${String(i+1).padStart(3, '0')}</span>
-                                        <span class="scenario-badge ${s.type === 'stress' ? 'badge-stress' : 'badge-stochastic'}">
-                                            ${s.type === 'stress' ? '⚠️ Stress' : '⚡ Stochastic'}
-                                        </span>
-                                    </div>
-                                    <div class="scenario-name">${s.name}</div>
-                                </div>
-                                <div class="scenario-impacts">
-                                    <div class="impact-item">
-                                        <div class="impact-label">NII Impact</div>
-                                        <div class="impact-value ${impact.nii < 0 ? 'negative' : 'positive'}">${impact.nii > 0 ? '+' : ''}${impact.nii}%</div>
-                                    </div>
-                                    <div class="impact-item">
-                                        <div class="impact-label">EVE Impact</div>
-                                        <div class="impact-value ${impact.eve < 0 ? 'negative' : 'positive'}">${impact.eve > 0 ? '+' : ''}${impact.eve}%</div>
-                                    </div>
-                                </div>
-                            </div>
-                            <div class="scenario-desc">${s.description}</div>
-                            <div class="scenario-footer">
-                                <div class="shocks-count">
-                                    📉 ${s.num_shocks} shocks applied
-                                </div>
-                                <button class="toggle-btn" onclick="toggleShocks(${i})">
-                                    View Details ▼
-                                </button>
-                            </div>
-                        </div>
-                        <div class="shocks-detail" id="shocks-${i}">
-                            <div class="shocks-title">Applied Shocks</div>
-                            <div class="shocks-list">
-                                ${s.shocks.slice(0, 10).map(shock => `
-                                    <div class="shock-item">
-                                        <div class="shock-info">
-                                            <span class="shock-type-badge">${shock.factor_type.replace('_', ' ')}</span>
-                                            <span class="shock-factor">${shock.factor_id}</span>
-                                        </div>
-                                        <div class="shock-value-info">
-                                            <span class="shock-method">${shock.shock_type}</span>
-                                            <span class="shock-value ${shock.value > 0 ? 'positive' : 'negative'}">${shock.value > 0 ? '+' : ''}${shock.value}</span>
-                                        </div>
-                                    </div>
-                                `).join('')}
-                                ${s.num_shocks > 10 ? `<div class="more-shocks">... and ${s.num_shocks - 10} more shocks</div>` : ''}
-                            </div>
-                        </div>
-                    </div>
-                `;
+                if (!observer || i < SCENARIO_EAGER_COUNT) {
+                    list.append(buildScenarioCard(s, i));
+                } else {
+                    const placeholder = h('div', {
+                        className: 'scenario-card',
+                        'data-idx': i,
+                        style: 'height: 180px;'
+                    });
+                    list.append(placeholder);
+                    observer.observe(placeholder);
+                }
             });
-            
-            html += `
-                </div>
-                
-                <div class="success-banner" style="margin-top: 1.5rem;">
-                    <div class="success-content">
-                        <div class="success-icon">📊</div>
-                        <div class="success-text">
-                            <h4>Results Saved</h4>
-                            <p>${csvFile}</p>
-                        </div>
-                    </div>
-                </div>
-            `;
-            
-            return html;
+            frag.append(list);
+
+            frag.append(
+                h('div', {className: 'success-banner', style: 'margin-top: 1.5rem;'},
+                    h('div', {className: 'success-content'},
+                        h('div', {className: 'success-icon'}, '📊'),
+                        h('div', {className: 'success-text'},
+                            h('h4', null, 'Results Saved'),
+                            h('p', null, csvFile)))));
+
+            return frag;
+        }
+
+        const SCENARIO_EAGER_COUNT = 20;
+        let scenarioObserver = null;
+
+        function makeScenarioObserver(scenarios) {
+            if (scenarioObserver) scenarioObserver.disconnect();
+            scenarioObserver = new IntersectionObserver((entries) => {
+                for (const entry of entries) {
+                    if (!entry.isIntersecting) continue;
+                    const placeholder = entry.target;
+                    scenarioObserver.unobserve(placeholder);
+                    const idx = Number(placeholder.dataset.idx);
+                    placeholder.replaceWith(buildScenarioCard(scenarios[idx], idx));
+                }
+            }, { rootMargin: '600px 0px' });  // ~3 cards of overscan
+            return scenarioObserver;
+        }
+
+        // The card shell is parsed once from scenarioCardTpl and
+        // cloned per scenario; only the data-field hooks get patched.
+        // The variable-length shocks list is still built with h().
+        let scenarioCardProto = null;
+
+        // Display ids are shared by every render and the CSV export;
+        // memoize them instead of re-padding per card per pass
+        const SCN_IDS = [];
+        function scnId(i) {
+            return SCN_IDS[i] || (SCN_IDS[i] = 'SCN_' + String(i + 1).padStart(3, '0'));
+        }
+        const STRESS_BADGE = '⚠️ Stress';
+        const STOCH_BADGE = '⚡ Stochastic';
+
+        function buildScenarioCard(s, i) {
+            const impact = s.impact || {nii: 0, eve: 0, var: 0};
+            if (!scenarioCardProto) {
+                scenarioCardProto = document.getElementById('scenarioCardTpl').content.firstElementChild;
+            }
+            const card = scenarioCardProto.cloneNode(true);
+            const field = (name) => card.querySelector(`[data-field="${name}"]`);
+
+            const isStress = s.type === 'stress';
+            field('id').textContent = scnId(i);
+            const badge = field('badge');
+            badge.classList.add(isStress ? 'badge-stress' : 'badge-stochastic');
+            badge.textContent = isStress ? STRESS_BADGE : STOCH_BADGE;
+            field('name').textContent = s.name;
+            const nii = field('nii');
+            nii.classList.add(impact.nii < 0 ? 'negative' : 'positive');
+            nii.textContent = (impact.nii > 0 ? '+' : '') + impact.nii + '%';
+            const eve = field('eve');
+            eve.classList.add(impact.eve < 0 ? 'negative' : 'positive');
+            eve.textContent = (impact.eve > 0 ? '+' : '') + impact.eve + '%';
+            field('desc').textContent = s.description;
+            field('shocksCount').textContent = `📉 ${s.num_shocks} shocks applied`;
+            card.querySelector('.toggle-btn').dataset.idx = i;
+            card.querySelector('.shocks-detail').id = `shocks-${i}`;
+
+            const shocksList = card.querySelector('.shocks-list');
+            for (const shock of s.shocks.slice(0, 10)) {
+                shocksList.append(
+                    h('div', {className: 'shock-item'},
+                        h('div', {className: 'shock-info'},
+                            h('span', {className: 'shock-type-badge'}, shock.factor_type.replace('_', ' ')),
+                            h('span', {className: 'shock-factor'}, shock.factor_id)),
+                        h('div', {className: 'shock-value-info'},
+                            h('span', {className: 'shock-method'}, shock.shock_type),
+                            h('span', {className: 'shock-value ' + (shock.value > 0 ? 'positive' : 'negative')},
+                                (shock.value > 0 ? '+' : '') + shock.value))));
+            }
+            if (s.num_shocks > 10) {
+                shocksList.append(h('div', {className: 'more-shocks'}, `... and ${s.num_shocks - 10} more shocks`));
+            }
+
+            return card;
         }
         
-        // Toggle shocks visibility
+        // Toggle shocks visibility. Results render in one place now, so
+        // a single id lookup replaces the old querySelectorAll sweep for
+        // duplicated ids (which re-toggled the first match straight back)
         function toggleShocks(index) {
             const detail = document.getElementById(`shocks-${index}`);
-            detail.classList.toggle('expanded');
-            
-            // Also check for duplicate in results tab
-            const allDetails = document.querySelectorAll(`#shocks-${index}`);
-            allDetails.forEach(d => d.classList.toggle('expanded'));
+            if (detail) detail.classList.toggle('expanded');
         }
         
         // Initialize charts
+        // Live Chart.js instances, keyed by canvas id. A refresh that
+        // keeps its canvas feeds the instance new data and calls
+        // update('none') — no config re-parse, no scale re-layout, no
+        // animation. When the results render replaces the canvas, the
+        // stale instance is destroyed and rebuilt against the new node.
+        const chartRegistry = {};
+
+        // No entry animations: first render paints final state in one
+        // frame instead of tweening for ~300 ms (reuse renders already
+        // pass update('none'))
+        if (window.Chart) {
+            Chart.defaults.animation = false;
+            Chart.defaults.animations.colors = false;
+            Chart.defaults.animations.numbers = false;
+        }
+
+        const CHART_TICK_COLOR = 'hsl(215, 20%, 55%)';
+        const CHART_GRID_COLOR = 'hsl(217, 33%, 17%)';
+        const CHART_PALETTE = [
+            'rgba(20, 184, 166, 0.8)',
+            'rgba(56, 189, 248, 0.8)',
+            'rgba(167, 139, 250, 0.8)',
+            'rgba(251, 191, 36, 0.8)',
+            'rgba(239, 68, 68, 0.8)',
+            'rgba(148, 163, 184, 0.8)'
+        ];
+
         function initCharts(scenarios, report, location = 'inline') {
             // Create unique IDs based on location
             const impactId = location === 'results' ? 'impactChartResults' : 'impactChart';
             const distId = location === 'results' ? 'distributionChartResults' : 'distributionChart';
-            
-            console.log('Initializing charts for location:', location);
-            console.log('Impact ID:', impactId, 'Dist ID:', distId);
-            
+
+            // One pass over the impacts instead of three .map
+            // traversals; the typed arrays go straight into Chart.js
+            const impacts = report.scenarioImpacts;
+            const impactLabels = new Array(impacts.length);
+            const niiData = new Float32Array(impacts.length);
+            const eveData = new Float32Array(impacts.length);
+            for (let i = 0; i < impacts.length; i++) {
+                impactLabels[i] = impacts[i].name;
+                niiData[i] = impacts[i].nii;
+                eveData[i] = impacts[i].eve;
+            }
+
             // Impact Chart
             const impactCtx = document.getElementById(impactId);
             if (impactCtx) {
-                console.log('Found impact canvas:', impactId);
-                
-                // Destroy existing chart for this location if it exists
-                try {
-                    const existingChart = Chart.getChart(impactCtx);
-                    if (existingChart) {
-                        console.log('Destroying existing impact chart');
-                        existingChart.destroy();
-                    }
-                } catch (e) {
-                    console.log('No existing impact chart to destroy');
-                }
-                
-                const newImpactChart = new Chart(impactCtx, {
-                    type: 'bar',
-                    data: {
-                        labels: report.scenarioImpacts.map(s => s.name),
-                        datasets: [
-                            {
-                                label: 'NII Impact %',
-                                data: report.scenarioImpacts.map(s => s.nii),
-                                backgroundColor: 'rgba(20, 184, 166, 0.8)',
-                                borderRadius: 4
-                            },
-                            {
-                                label: 'EVE Impact %',
-                                data: report.scenarioImpacts.map(s => s.eve),
-                                backgroundColor: 'rgba(56, 189, 248, 0.8)',
-                                borderRadius: 4
-                            }
-                        ]
-                    },
-                    options: {
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {
-                            legend: {
-                                labels: { color: 'hsl(215, 20%, 55%)' }
-                            }
+                const existing = chartRegistry[impactId];
+                if (existing && existing.canvas === impactCtx) {
+                    existing.data.labels = impactLabels;
+                    existing.data.datasets[0].data = niiData;
+                    existing.data.datasets[1].data = eveData;
+                    existing.update('none');
+                } else {
+                    if (existing) existing.destroy();
+                    chartRegistry[impactId] = new Chart(impactCtx, {
+                        type: 'bar',
+                        data: {
+                            labels: impactLabels,
+                            datasets: [
+                                {
+                                    label: 'NII Impact %',
+                                    data: niiData,
+                                    backgroundColor: 'rgba(20, 184, 166, 0.8)',
+                                    borderRadius: 4
+                                },
+                                {
+                                    label: 'EVE Impact %',
+                                    data: eveData,
+                                    backgroundColor: 'rgba(56, 189, 248, 0.8)',
+                                    borderRadius: 4
+                                }
+                            ]
                         },
-                        scales: {
-                            x: {
-                                ticks: { color: 'hsl(215, 20%, 55%)', font: { size: 10 } },
-                                grid: { color: 'hsl(217, 33%, 17%)' }
+                        options: {
+                            responsive: true,
+                            maintainAspectRatio: false,
+                            plugins: {
+                                legend: {
+                                    labels: { color: CHART_TICK_COLOR }
+                                }
                             },
-                            y: {
-                                ticks: { color: 'hsl(215, 20%, 55%)' },
-                                grid: { color: 'hsl(217, 33%, 17%)' }
+                            scales: {
+                                x: {
+                                    ticks: { color: CHART_TICK_COLOR, font: { size: 10 } },
+                                    grid: { color: CHART_GRID_COLOR }
+                                },
+                                y: {
+                                    ticks: { color: CHART_TICK_COLOR },
+                                    grid: { color: CHART_GRID_COLOR }
+                                }
                             }
                         }
-                    }
-                });
+                    });
+                }
             }
-            
+
             // Distribution Chart
             const distCtx = document.getElementById(distId);
             if (distCtx) {
-                if (distributionChart) distributionChart.destroy();
-                
-                const colors = [
-                    'rgba(20, 184, 166, 0.8)',
-                    'rgba(56, 189, 248, 0.8)',
-                    'rgba(167, 139, 250, 0.8)',
-                    'rgba(251, 191, 36, 0.8)',
-                    'rgba(239, 68, 68, 0.8)',
-                    'rgba(148, 163, 184, 0.8)'
-                ];
-                
-                distributionChart = new Chart(distCtx, {
-                    type: 'doughnut',
-                    data: {
-                        labels: report.riskFactorDistribution.map(r => r.name),
-                        datasets: [{
-                            data: report.riskFactorDistribution.map(r => r.count),
-                            backgroundColor: colors.slice(0, report.riskFactorDistribution.length),
-                            borderWidth: 0
-                        }]
-                    },
-                    options: {
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        cutout: '60%',
-                        plugins: {
-                            legend: {
-                                position: 'right',
-                                labels: { 
-                                    color: 'hsl(215, 20%, 55%)',
-                                    font: { size: 11 },
-                                    padding: 12
+                // Labels, counts and slice colors in a single pass; the
+                // modulo wraps the palette so a distribution wider than
+                // six factors no longer runs out of colors
+                const distribution = report.riskFactorDistribution;
+                const distLabels = new Array(distribution.length);
+                const distData = new Float32Array(distribution.length);
+                const distColors = new Array(distribution.length);
+                for (let i = 0; i < distribution.length; i++) {
+                    distLabels[i] = distribution[i].name;
+                    distData[i] = distribution[i].count;
+                    distColors[i] = CHART_PALETTE[i % CHART_PALETTE.length];
+                }
+
+                const existing = chartRegistry[distId];
+                if (existing && existing.canvas === distCtx) {
+                    existing.data.labels = distLabels;
+                    existing.data.datasets[0].data = distData;
+                    existing.data.datasets[0].backgroundColor = distColors;
+                    existing.update('none');
+                } else {
+                    if (existing) existing.destroy();
+                    chartRegistry[distId] = new Chart(distCtx, {
+                        type: 'doughnut',
+                        data: {
+                            labels: distLabels,
+                            datasets: [{
+                                data: distData,
+                                backgroundColor: distColors,
+                                borderWidth: 0
+                            }]
+                        },
+                        options: {
+                            responsive: true,
+                            maintainAspectRatio: false,
+                            cutout: '60%',
+                            plugins: {
+                                legend: {
+                                    position: 'right',
+                                    labels: {
+                                        color: CHART_TICK_COLOR,
+                                        font: { size: 11 },
+                                        padding: 12
+                                    }
                                 }
                             }
                         }
-                    }
-                });
+                    });
+                }
             }
         }
         
         // Export CSV
         function exportCSV() {
             if (!currentScenarios.length) return;
-            
-            let csv = 'Scenario ID,Name,Type,Description,Shocks,NII Impact,EVE Impact,VaR\\n';
-            currentScenarios.forEach((s, i) => {
-                const impact = s.impact || {nii: 0, eve: 0, var: 0};
-                csv += `SCN_${String(i+1).padStart(3, '0')},"${s.name}",${s.type},"${s.description}",${s.num_shocks},${impact.nii},${impact.eve},${impact.var}\\n`;
-            });
-            
-            const blob = new Blob([csv], {type: 'text/csv'});
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = `scenarios_${new Date().toISOString().split('T')[0]}.csv`;
-            a.click();
-            URL.revokeObjectURL(url);
+            // The server already holds the generated DataFrame; let
+            // pandas' C csv writer serialize the full shock-level file
+            // instead of rebuilding a summary CSV from the JSON payload
+            window.location = '/api/scenarios/export.csv';
         }
     </script>
 </body>
 </html>
 """
 
+# Split the ~40 KB inline stylesheet out to a content-hashed static
+# asset: browsers cache /static/app.<hash>.css with an immutable
+# far-future lifetime (see _immutable_static below), so repeat visits
+# only transfer the much smaller HTML. The hash changes with the CSS,
+# busting the cache exactly when needed.
+_style_start = HTML.find('<style>')
+_style_end = HTML.find('</style>')
+if _style_start != -1 and _style_end != -1:
+    _css = HTML[_style_start + len('<style>'):_style_end]
+    CSS_FILENAME = f"app.{hashlib.blake2b(_css.encode(), digest_size=6).hexdigest()}.css"
+    os.makedirs(os.path.join(app.root_path, 'static'), exist_ok=True)
+    _css_path = os.path.join(app.root_path, 'static', CSS_FILENAME)
+    if not os.path.exists(_css_path):
+        with open(_css_path, 'wb') as f:
+            f.write(_css.encode('utf-8'))
+    HTML = (
+        HTML[:_style_start]
+        + f'<link rel="stylesheet" href="/static/{CSS_FILENAME}">'
+        + HTML[_style_end + len('</style>'):]
+    )
+
+@app.after_request
+def _immutable_static(resp):
+    # Content-hashed assets never change in place, so cache them forever
+    if request.path.startswith('/static/app.'):
+        resp.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return resp
+
+# The served page inlines the current prompt count into the prompts-tab
+# badge (__PROMPTS_COUNT__ marker) so the first paint shows the right
+# number instead of 0 until /api/prompts answers. Encoded + compressed
+# variants are cached per count — it changes rarely — so the
+# precompression and ETag short-circuit are preserved.
+_INDEX_VARIANTS_CAPACITY = 8
+_index_variants = OrderedDict()  # prompts_count -> (raw, gz, br, etag)
+_index_variants_lock = threading.Lock()
+
+def _index_variant(prompts_count: int):
+    """Rendered/encoded page for a given badge count (cached)"""
+    with _index_variants_lock:
+        entry = _index_variants.get(prompts_count)
+        if entry is not None:
+            _index_variants.move_to_end(prompts_count)
+            return entry
+
+    raw = HTML.replace('__PROMPTS_COUNT__', str(prompts_count), 1).encode('utf-8')
+    gz = gzip.compress(raw, 9)
+    br = brotli.compress(raw, quality=11) if brotli is not None else None
+    etag = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    entry = (raw, gz, br, etag)
+
+    with _index_variants_lock:
+        _index_variants[prompts_count] = entry
+        _index_variants.move_to_end(prompts_count)
+        while len(_index_variants) > _INDEX_VARIANTS_CAPACITY:
+            _index_variants.popitem(last=False)
+    return entry
+
 
 # ============================================================================
 # PROMPT MANAGEMENT API ROUTES
@@ -2437,7 +3324,16 @@ Counterparties: ${data.counterparties_count.toLocaleString()}`;
 def get_prompts():
     try:
         prompts = load_prompts()
-        return jsonify({'success': True, 'prompts': prompts})
+        # Strong ETag over the body so unchanged prompt lists answer
+        # with a bodyless 304 instead of re-sending the whole library
+        if orjson is not None:
+            body = orjson.dumps({'success': True, 'prompts': prompts})
+        else:
+            body = json.dumps({'success': True, 'prompts': prompts}).encode('utf-8')
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=304, headers={'ETag': etag})
+        return Response(body, mimetype='application/json', headers={'ETag': etag})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -2453,9 +3349,11 @@ def save_prompt_api():
         
         prompt_id = data.get('id')
         if prompt_id:
-            idx = next((i for i, p in enumerate(prompts) if p['id'] == prompt_id), None)
-            if idx is not None:
-                prompts[idx].update({
+            # Index lookup — the returned dict is the same object that
+            # sits in the prompts list, so updating it in place works
+            existing = get_prompt_by_id(prompt_id)
+            if existing is not None:
+                existing.update({
                     'name': data['name'],
                     'description': data.get('description', ''),
                     'prompt_text': data['prompt_text'],
@@ -2486,7 +3384,7 @@ def save_prompt_api():
 def delete_prompt_api(prompt_id):
     try:
         prompts = load_prompts()
-        prompt = next((p for p in prompts if p['id'] == prompt_id), None)
+        prompt = get_prompt_by_id(prompt_id)
         if not prompt:
             return jsonify({'success': False, 'error': 'Not found'}), 404
         if prompt.get('is_default'):
@@ -2502,26 +3400,45 @@ def delete_prompt_api(prompt_id):
 @app.route('/api/prompts/export', methods=['GET'])
 def export_prompts_api():
     try:
-        import io
         prompts = load_prompts()
-        output = io.BytesIO()
-        output.write(json.dumps(prompts, indent=2).encode('utf-8'))
-        output.seek(0)
-        return send_file(output, mimetype='application/json', as_attachment=True,
-                        download_name=f'prompts_{datetime.now().strftime("%Y%m%d")}.json')
+        if orjson is not None:
+            body = orjson.dumps(prompts, option=orjson.OPT_INDENT_2)
+        else:
+            body = json.dumps(prompts, indent=2, ensure_ascii=False).encode('utf-8')
+        headers = {
+            'Content-Disposition':
+                f'attachment; filename=prompts_{datetime.now().strftime("%Y%m%d")}.json'
+        }
+        # Content-Encoding compresses the download ~10x on the wire; the
+        # browser inflates transparently and saves plain JSON
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, 6)
+            headers['Content-Encoding'] = 'gzip'
+        return Response(body, mimetype='application/json', headers=headers)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/prompts/import', methods=['POST'])
 def import_prompts_api():
     try:
-        data = request.json
-        new_prompts = data.get('prompts', [])
+        raw = request.get_data()
+        # Gzipped bundles (.json.gz) are detected by magic bytes, so
+        # compressed exports round-trip through import unchanged
+        if raw[:2] == b'\x1f\x8b':
+            raw = gzip.decompress(raw)
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        # Accept either a raw export (bare list, uploaded as-is by the
+        # UI) or the wrapped {'prompts': [...]} form
+        new_prompts = data if isinstance(data, list) else data.get('prompts', [])
         if not isinstance(new_prompts, list):
             return jsonify({'success': False, 'error': 'Invalid format'}), 400
         
         current = load_prompts()
-        existing_ids = {p['id'] for p in current}
+        # Reuse the cached id index instead of building a fresh set;
+        # fall back to a comprehension only when the cache is cold
+        with _prompts_cache_lock:
+            index = _prompts_cache['by_id'] if _prompts_cache['value'] is current else None
+        existing_ids = index.keys() if index is not None else {p['id'] for p in current}
         imported = 0
         
         for p in new_prompts:
@@ -2554,11 +3471,8 @@ def load_data_api():
         if model_id == '':
             model_id = None
             
-        print(f"\n{'='*60}")
-        print(f"Data Load Request:")
-        print(f"  Model ID: {model_id or 'All models'}")
-        print(f"  Limit: {limit or 'No limit'}")
-        print(f"{'='*60}\n")
+        log.info("Data load request: model_id=%s limit=%s",
+                 model_id or 'All models', limit or 'No limit')
         
         # Load data with configuration
         risk_factors, counterparties, contracts = load_data_with_config(
@@ -2574,18 +3488,97 @@ def load_data_api():
             'risk_factors_count': len(risk_factors) if risk_factors else 0,
             'contracts_count': len(contracts),
             'counterparties_count': len(counterparties),
-            'timestamp': cache['load_timestamp']
+            'timestamp': cache.load_timestamp
         })
         
     except Exception as e:
-        import traceback
-        print(f"✗ Error loading data: {e}")
-        traceback.print_exc()
+        log.exception("Error loading data: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/data/status', methods=['GET'])
+def data_status_api():
+    """Cheap probe of the server-side dataset cache for page bootstrap"""
+    return jsonify({
+        'loaded': cache.loaded,
+        'model_id': cache.model_id,
+        'limit': cache.limit,
+        'risk_factors_count': len(cache.risk_factors) if cache.risk_factors else 0,
+        'contracts_count': len(cache.contracts) if cache.contracts else 0,
+        'counterparties_count': len(cache.counterparties) if cache.counterparties else 0,
+        'timestamp': cache.load_timestamp,
+    })
+
+@app.route('/api/scenarios/export.csv')
+def export_scenarios_csv():
+    """Serve the last generated scenarios as shock-level CSV.
+
+    The frame is serialized server-side with pandas' C csv writer, so
+    the browser no longer rebuilds a CSV from the JSON payload — and
+    this file carries every shock, not just the per-scenario summary.
+    Rows stream out in slices, so memory is bounded by one slice and
+    the download starts before serialization finishes.
+    """
+    df = cache.last_df
+    if df is None:
+        return jsonify({'success': False, 'error': 'No scenarios generated yet'}), 404
+
+    def stream():
+        for start in range(0, len(df), 1000):
+            yield df.iloc[start:start + 1000].to_csv(header=(start == 0), index=False)
+
+    headers = {
+        'Content-Disposition': f'attachment; filename={cache.last_csv_name or "scenarios.csv"}'
+    }
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        # Incremental gzip: compressobj with the gzip-container wbits
+        # keeps the response chunked instead of buffering it whole
+        def gz():
+            comp = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            for chunk in stream():
+                out = comp.compress(chunk.encode('utf-8'))
+                if out:
+                    yield out
+            yield comp.flush()
+        headers['Content-Encoding'] = 'gzip'
+        return Response(gz(), mimetype='text/csv', headers=headers)
+    return Response(stream(), mimetype='text/csv', headers=headers)
+
+@app.route('/cache/invalidate', methods=['POST'])
+def invalidate_data_cache():
+    """Drop all cached datasets so the next load re-reads Risk HUB"""
+    _dataset_cache.clear()
+    cache.loaded = False
+    cache.risk_factors = None
+    cache.counterparties = None
+    cache.contracts = None
+    cache.model_id = None
+    cache.limit = None
+    cache.load_timestamp = None
+    return jsonify({'success': True})
+
 @app.route('/')
 def index():
-    return render_template_string(HTML)
+    # Cheap thanks to the mtime-keyed prompts cache
+    raw, gz, br, etag = _index_variant(len(load_prompts()))
+
+    # Let browsers reuse the page for 5 minutes (revalidating against
+    # the ETag afterwards) instead of refetching it on every navigation
+    headers = {
+        'ETag': etag,
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': 'public, max-age=300, stale-while-revalidate=3600',
+    }
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers=headers)
+
+    accept_encoding = request.headers.get('Accept-Encoding', '')
+    if br is not None and 'br' in accept_encoding:
+        headers['Content-Encoding'] = 'br'
+        return Response(br, mimetype='text/html', headers=headers)
+    if 'gzip' in accept_encoding:
+        headers['Content-Encoding'] = 'gzip'
+        return Response(gz, mimetype='text/html', headers=headers)
+    return Response(raw, mimetype='text/html', headers=headers)
 
 @app.route('/generate', methods=['POST'])
 def generate():
@@ -2596,27 +3589,21 @@ def generate():
         scenario_type = data.get('scenario_type', 'stress')
         prompt_id = data.get('prompt_id')
         
-        print(f"\n{'='*60}")
-        print(f"Web request:")
-        print(f"  Instruction: {instruction[:100]}...")
-        print(f"  Num scenarios: {num_scenarios}")
-        print(f"  Type: {scenario_type}")
-        print(f"  Prompt ID: {prompt_id}")
-        print(f"{'='*60}\n")
+        log.info("Generate request: instruction=%.100s num_scenarios=%s type=%s prompt_id=%s",
+                 instruction, num_scenarios, scenario_type, prompt_id)
         
         # Validate prompt is provided
         if not prompt_id:
             return jsonify({'success': False, 'error': 'No prompt selected. Please select an LLM prompt first.'}), 400
         
-        # Load the selected prompt
-        prompts = load_prompts()
-        selected_prompt = next((p for p in prompts if p['id'] == prompt_id), None)
+        # Load the selected prompt (cached id index — no linear scan)
+        selected_prompt = get_prompt_by_id(prompt_id)
         
         if not selected_prompt:
             return jsonify({'success': False, 'error': f'Prompt {prompt_id} not found'}), 400
         
-        print(f"🤖 Using LLM prompt: {selected_prompt['name']}")
-        print(f"   Description: {selected_prompt.get('description', 'N/A')}")
+        log.info("Using LLM prompt: %s (%s)", selected_prompt['name'],
+                 selected_prompt.get('description', 'N/A'))
         
         # Use cached data (must be loaded via /api/data/load first)
         try:
@@ -2637,11 +3624,11 @@ def generate():
 
 User Request:
 {instruction}'''
-            print(f"📝 Injected prompt into instruction context")
+            log.debug("Injected prompt into instruction context")
         else:
             full_instruction = instruction
-        
-        print("Generating scenarios...")
+
+        log.info("Generating scenarios...")
         scenarios, df = generator.generate_scenarios(
             risk_factors=risk_factors,
             counterparties=counterparties,
@@ -2651,33 +3638,69 @@ User Request:
             scenario_type=scenario_type
         )
         
+        # Factor-type distribution and the shock total come straight
+        # from the frame: value_counts counts (and ranks) in C, replacing
+        # the per-shock Python counting loop
+        total_shocks = len(df)
+        if total_shocks:
+            factor_dist = [
+                {'name': k, 'count': int(v)}
+                for k, v in (df['factor_type']
+                             .str.replace('_', ' ', regex=False)
+                             .value_counts().items())
+            ]
+        else:
+            factor_dist = []
+
+        # Stamp the SCN_ ids the UI displays onto the shock rows, so
+        # exports need no client-side reformatting. Ids are assigned
+        # positionally — the parser emits rows scenario by scenario —
+        # since LLM-generated scenario names can collide, and a
+        # shock-free batch leaves the frame empty and column-less
+        if total_shocks:
+            df.insert(0, 'scenario_id', np.repeat(
+                [f'SCN_{i + 1:03d}' for i in range(len(scenarios))],
+                [len(s.shocks) for s in scenarios]))
+
         # Save to CSV
         csv_file = f"scenarios_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         df.to_csv(csv_file, index=False)
-        print(f"✓ Saved to {csv_file}\n")
+        log.info("Saved to %s", csv_file)
+
+        # Keep the frame around for /api/scenarios/export.csv
+        cache.last_df = df
+        cache.last_csv_name = csv_file
         
-        # Build result with impact metrics
+        # Build result with impact metrics, accumulating every report
+        # aggregate in the same pass — one traversal instead of a loop
+        # plus four comprehensions over the finished list
         result = []
-        factor_counts = {}
-        total_shocks = 0
-        
-        for i, s in enumerate(scenarios):
+        scenario_impacts = []
+        stress_count = 0
+        nii_sum = eve_sum = 0.0
+        var_max = float('-inf')
+
+        for s in scenarios:
             impact = generate_impact_metrics()
-            shocks_data = []
-            
-            for sh in s.shocks:
-                shocks_data.append({
-                    'factor_type': sh.factor_type, 
-                    'factor_id': sh.factor_id, 
-                    'shock_type': sh.shock_type, 
-                    'value': sh.value
-                })
-                # Count factor types
-                factor_type = sh.factor_type.replace('_', ' ')
-                factor_counts[factor_type] = factor_counts.get(factor_type, 0) + 1
-            
-            total_shocks += len(s.shocks)
-            
+            shocks_data = [{
+                'factor_type': sh.factor_type,
+                'factor_id': sh.factor_id,
+                'shock_type': sh.shock_type,
+                'value': sh.value
+            } for sh in s.shocks]
+
+            if s.scenario_type == 'stress':
+                stress_count += 1
+            nii_sum += impact['nii']
+            eve_sum += impact['eve']
+            if impact['var'] > var_max:
+                var_max = impact['var']
+            scenario_impacts.append({
+                'name': s.name[:20] + '...' if len(s.name) > 20 else s.name,
+                'nii': impact['nii'],
+                'eve': impact['eve']
+            })
+
             result.append({
                 'name': s.name,
                 'description': s.description,
@@ -2686,68 +3709,69 @@ User Request:
                 'shocks': shocks_data,
                 'impact': impact
             })
-        
-        # Generate report data
-        stress_count = sum(1 for s in result if s['type'] == 'stress')
-        avg_nii = round(sum(s['impact']['nii'] for s in result) / len(result), 1)
-        avg_eve = round(sum(s['impact']['eve'] for s in result) / len(result), 1)
-        max_var = round(max(s['impact']['var'] for s in result), 1)
-        
+
+        if not result:
+            return jsonify({'success': False, 'error': 'No scenarios generated'}), 500
+
         report = {
             'totalScenarios': len(result),
             'stressScenarios': stress_count,
             'stochasticScenarios': len(result) - stress_count,
             'totalShocks': total_shocks,
             'impactSummary': {
-                'avgNiiImpact': avg_nii,
-                'avgEveImpact': avg_eve,
-                'maxVaR': max_var
+                'avgNiiImpact': round(nii_sum / len(result), 1),
+                'avgEveImpact': round(eve_sum / len(result), 1),
+                'maxVaR': round(var_max, 1)
             },
-            'riskFactorDistribution': [
-                {'name': k, 'count': v} 
-                for k, v in sorted(factor_counts.items(), key=lambda x: -x[1])
-            ],
-            'scenarioImpacts': [
-                {
-                    'name': s['name'][:20] + '...' if len(s['name']) > 20 else s['name'],
-                    'nii': s['impact']['nii'],
-                    'eve': s['impact']['eve']
-                }
-                for s in result
-            ]
+            'riskFactorDistribution': factor_dist,
+            'scenarioImpacts': scenario_impacts
         }
         
-        return jsonify({
-            'success': True, 
-            'scenarios': result, 
+        # Serialize once and gzip when the client accepts it — shocks
+        # arrays make this the largest JSON body the app sends, and the
+        # browser inflates transparently so the client code is unchanged
+        payload = {
+            'success': True,
+            'scenarios': result,
             'report': report,
             'csv_file': csv_file
-        })
-        
+        }
+        if orjson is not None:
+            body = orjson.dumps(payload)
+        else:
+            body = json.dumps(payload).encode('utf-8')
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            return Response(gzip.compress(body, 6), mimetype='application/json',
+                            headers={'Content-Encoding': 'gzip'})
+        return Response(body, mimetype='application/json')
+
     except Exception as e:
-        import traceback
-        print(f"✗ Error: {e}")
-        traceback.print_exc()
+        log.exception("Error generating scenarios: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/status')
 def status():
-    """Return platform status"""
-    try:
-        risk_factors, counterparties, contracts = load_data()
-        return jsonify({
+    """Return platform status from the dataset cache — no data reload"""
+    # The old body called load_data() (undefined here) and fell through
+    # to the disconnected stub on every hit; counts now come straight
+    # from the cache populated by /api/data/load
+    if cache.loaded:
+        body = jsonify({
             'connected': True,
-            'contracts': len(contracts),
-            'risk_factors': len(risk_factors) if risk_factors else 247,
-            'counterparties': len(counterparties) if counterparties else 0
+            'contracts': len(cache.contracts) if cache.contracts else 0,
+            'risk_factors': len(cache.risk_factors) if cache.risk_factors else 247,
+            'counterparties': len(cache.counterparties) if cache.counterparties else 0
         })
-    except:
-        return jsonify({
+    else:
+        body = jsonify({
             'connected': False,
             'contracts': 0,
             'risk_factors': 0,
             'counterparties': 0
         })
+    # Let poll widgets coalesce in the browser cache for a few seconds
+    body.headers['Cache-Control'] = 'max-age=5'
+    return body
 
 if __name__ == '__main__':
     print("=" * 60)
@@ -2764,5 +3788,11 @@ if __name__ == '__main__':
     print("    • CSV export functionality")
     print()
     print("  Press Ctrl+C to stop")
+    print()
+    print("  Dev server. For concurrent production use run under gunicorn:")
+    print("    gunicorn -k gevent -w 4 -b 0.0.0.0:8081 \\")
+    print("        --timeout 180 web_interface_STATE_MANAGED_09:app")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=8081, debug=False)
+    # threaded=True so a long Ollama-bound /generate doesn't block
+    # every other request — Werkzeug is single-threaded by default
+    app.run(host='0.0.0.0', port=8081, debug=False, threaded=True)